@@ -0,0 +1,161 @@
+#!/Users/user/venv/bin/python
+import argparse
+import datetime
+import functools
+import numpy as np
+
+# Closed-form (NOAA solar calculator) sunrise and sunset, for whole years of dates at once with
+# NumPy. The Sun's declination and the equation of time come from the NOAA series; the hour angle
+# is for the upper limb with standard refraction (zenith 90.833°), as swe.rise_trans computes.
+# Each event is the first one after 00:00 IST of its date, like sun_table.sun_event_jd().
+#
+# ERROR_BOUND is what the callers may trust, within VALID_LATITUDES and VALID_LONGITUDES only:
+# `python3 approximate_sun.py` measures the largest difference from swe.rise_trans there over
+# 1950-2100 (0.3 minutes) and checks it against the bound, which keeps a threefold margin.
+# approximate_critical() gives no estimate outside that area, nor on a date whose sunrise or
+# sunset is within the bound of 00:00 IST (it could belong to either date). Altitude is not modelled.
+ERROR_BOUND = 1 / 1440  # days (1 minute)
+VALID_LATITUDES = (8, 35)  # degrees north
+VALID_LONGITUDES = (68, 97)  # degrees east
+ZENITH = 90.833
+IST_OFFSET = 5.5 / 24  # days
+
+
+def _events_on(jd_midnight_utc, LAT, LON):
+    """NOAA sunrise and sunset JD (UT) on the UTC days starting at jd_midnight_utc (arrays)"""
+    rise = jd_midnight_utc + 0.25 - LON / 360  # first guesses: 06:00 and 18:00 local mean time
+    set_ = jd_midnight_utc + 0.75 - LON / 360
+    for _ in range(2):  # evaluate the Sun again at each event, once is within seconds
+        rise = jd_midnight_utc + _event_minutes(rise, LAT, LON, -1) / 1440
+        set_ = jd_midnight_utc + _event_minutes(set_, LAT, LON, +1) / 1440
+    return rise, set_
+
+
+def _event_minutes(jd, LAT, LON, sign):
+    """Minutes after 00:00 UTC of the event (sign -1 rise, +1 set), with the Sun taken at jd"""
+    t = (jd - 2451545.0) / 36525  # Julian centuries from J2000
+    mean_longitude = np.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360)
+    anomaly = np.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    eccentricity = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    center = np.radians(np.sin(anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+                        + np.sin(2 * anomaly) * (0.019993 - 0.000101 * t) + np.sin(3 * anomaly) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * t)
+    apparent = mean_longitude + center - np.radians(0.00569 + 0.00478 * np.sin(omega))
+    obliquity = np.radians(23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+                           + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(apparent))
+    y = np.tan(obliquity / 2) ** 2
+    equation_of_time = 4 * np.degrees(
+        y * np.sin(2 * mean_longitude) - 2 * eccentricity * np.sin(anomaly)
+        + 4 * eccentricity * y * np.sin(anomaly) * np.cos(2 * mean_longitude)
+        - 0.5 * y * y * np.sin(4 * mean_longitude) - 1.25 * eccentricity ** 2 * np.sin(2 * anomaly))
+    latitude = np.radians(LAT)
+    cos_hour_angle = (np.cos(np.radians(ZENITH)) / (np.cos(latitude) * np.cos(declination))
+                      - np.tan(latitude) * np.tan(declination))
+    hour_angle = np.degrees(np.arccos(np.clip(cos_hour_angle, -1, 1)))  # polar day/night: clipped, not trusted
+    return 720 - 4 * LON - equation_of_time + sign * 4 * hour_angle
+
+
+def _events_after_midnight(dates, LAT, LON):
+    """
+    (rise, set, trusted) arrays for the dates: each event the first after 00:00 IST of its date, and
+    whether both are far enough from that midnight for the choice of date to be certain.
+    """
+    ordinals = np.array([date.toordinal() for date in dates], dtype=float)
+    jd_midnight = ordinals + 1721424.5  # 00:00 UTC of each date
+    ist_midnight = jd_midnight - IST_OFFSET
+    events = []
+    trusted = np.ones(len(ordinals), dtype=bool)
+    for today, tomorrow in zip(_events_on(jd_midnight - 1, LAT, LON), _events_on(jd_midnight, LAT, LON)):
+        events.append(np.where(today >= ist_midnight, today, tomorrow))
+        trusted &= np.abs(today - ist_midnight) > ERROR_BOUND
+    return events[0], events[1], trusted
+
+
+def approximate_sun_events(dates, LAT, LON):
+    """
+    (rise, set) arrays of JD (UT) for the dates: each the first event after 00:00 IST of its date.
+    Within ERROR_BOUND of swe.rise_trans in the valid area, away from 00:00 IST.
+    """
+    rise, set_, _ = _events_after_midnight(dates, LAT, LON)
+    return rise, set_
+
+
+@functools.lru_cache(maxsize=16)
+def approximate_year(year, LAT, LON):
+    """_events_after_midnight() for every date of a year, computed once"""
+    first = datetime.date(year, 1, 1)
+    days = (datetime.date(year + 1, 1, 1) - first).days
+    return _events_after_midnight([first + datetime.timedelta(days=i) for i in range(days)], LAT, LON)
+
+
+def in_valid_area(LAT, LON):
+    """Whether ERROR_BOUND holds at the place (VALID_LATITUDES × VALID_LONGITUDES)"""
+    return VALID_LATITUDES[0] <= LAT <= VALID_LATITUDES[1] and VALID_LONGITUDES[0] <= LON <= VALID_LONGITUDES[1]
+
+
+def approximate_critical(date, LAT, LON):
+    """
+    (earliest, latest) JD (UT) that 0.6 of the daylight of date can be, from the NOAA times;
+    sankranti.critical_jd() is exactly known to lie in between. None where the estimate is not
+    trusted (outside the valid area, or an event near 00:00 IST): use rise_trans instead.
+    """
+    if not in_valid_area(LAT, LON):
+        return None
+    rises, sets, trusted = approximate_year(date.year, LAT, LON)
+    i = date.timetuple().tm_yday - 1
+    if not trusted[i]:
+        return None
+    critical = rises[i] + 0.6 * (sets[i] - rises[i])
+    bound = ERROR_BOUND  # 0.4 × rise error + 0.6 × set error
+    return float(critical - bound), float(critical + bound)
+
+
+# Places whose sunset falls near 00:00 IST: the date the NOAA event belongs to is uncertain there
+NEAR_MIDNIGHT = [(datetime.date(2026, 4, 14), 59.91, 10.75), (datetime.date(2022, 4, 14), 59.91, 10.75)]
+
+
+def main():
+    import swisseph as swe
+    from sankranti import critical_jd, get_sun_event_jd, ist_midnight_jd
+    parser = argparse.ArgumentParser(description="Largest error of the NOAA sunrise/sunset against swe.rise_trans")
+    parser.add_argument("--samples", type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    for _ in range(args.samples):
+        date = datetime.date(1950, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 150 * 365)))
+        LAT, LON = rng.uniform(*VALID_LATITUDES), rng.uniform(*VALID_LONGITUDES)
+        rise, set_, trusted = _events_after_midnight([date], LAT, LON)
+        if not trusted[0]:
+            continue
+        for approximate, event_type in ((rise[0], swe.CALC_RISE), (set_[0], swe.CALC_SET)):
+            exact = get_sun_event_jd(ist_midnight_jd(date), event_type, LAT, LON)
+            worst = max(worst, abs(approximate - exact))
+    print(f"largest error {worst * 1440:.2f} min, bound {ERROR_BOUND * 1440:.0f} min {'✅' if worst <= ERROR_BOUND else '❌'}")
+
+    # Anywhere else, approximate_critical() must either hold critical_jd() or decline to estimate
+    wrong = declined = 0
+    places = NEAR_MIDNIGHT + [
+        (datetime.date(1950, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 150 * 365))),
+         rng.uniform(-60, 66), rng.uniform(40, 125)) for _ in range(args.samples)]
+    for date, LAT, LON in places:
+        estimate = approximate_critical(date, LAT, LON)
+        if estimate is None:
+            declined += 1
+            continue
+        try:
+            exact = critical_jd(date, LAT, LON)
+        except RuntimeError:  # no sunrise or sunset that day
+            wrong += 1
+            continue
+        wrong += not estimate[0] <= exact <= estimate[1]
+    print(f"critical range: {wrong} of {len(places)} places and dates wrong, {declined} left to rise_trans"
+          f" {'✅' if not wrong else '❌'}")
+    if worst > ERROR_BOUND or wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import contextlib
+import os
+
+# Files other processes may be reading at the same time (the calendar tables, the sun, chart and
+# icon caches, the gazetteer index) are written under a temporary name beside them and renamed
+# over the old file, so a reader sees the old file or the new one, never part of one. The
+# temporary file is removed again if writing it fails or is interrupted.
+
+
+def atomic_write(path, write_fn):
+    """
+    Call write_fn(temp_path) to write the new contents, then rename temp_path to path.
+    Returns what write_fn returned; on any error path is left as it was.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(temp_path)  # left by an earlier process with the same id
+    try:
+        result = write_fn(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+    return result
@@ -0,0 +1,81 @@
+#!/Users/user/venv/bin/python
+# swe.calc_ut calls per sankranti: the old day-by-day scan + bisection against the speed-aware solver.
+# Usage: python3 bench_sankranti.py [--start 2024-01-01] [--end 2051-03-15]
+import argparse
+import datetime
+import time
+import swisseph as swe
+import sankranti
+
+calc_ut_calls = 0
+_calc_ut = swe.calc_ut
+
+
+def counting_calc_ut(*args, **kwargs):
+    global calc_ut_calls
+    calc_ut_calls += 1
+    return _calc_ut(*args, **kwargs)
+
+
+def bisect_previous_sankranti(jd_end):
+    """The previous solver: backward scan a day at a time, then bisect on int(lon // 30)"""
+    കൃത്യത = 0.0003
+
+    def sign_at(jd):
+        return int(swe.calc_ut(jd, swe.SUN, flags=swe.FLG_SIDEREAL)[0][0] // 30)
+
+    def find_crossing(low, high, sign_low):
+        while high - low > കൃത്യത:
+            mid = (low + high) / 2
+            if sign_at(mid) == sign_low:
+                low = mid
+            else:
+                high = mid
+        return (low + high) / 2
+
+    sign_before, sign_after = sign_at(jd_end - 1.0), sign_at(jd_end)
+    if sign_before != sign_after:
+        return find_crossing(jd_end - 1.0, jd_end, sign_before), sign_after
+    for i in range(1, 41):
+        sign1, sign2 = sign_at(jd_end - (i + 1)), sign_at(jd_end - i)
+        if sign1 != sign2:
+            return find_crossing(jd_end - (i + 1), jd_end - i, sign1), sign2
+    raise RuntimeError("No sankranti found within 40 days")
+
+
+def run(solver, jd_ends):
+    global calc_ut_calls
+    calc_ut_calls = 0
+    started = time.perf_counter()
+    results = [solver(jd) for jd in jd_ends]
+    return results, calc_ut_calls, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sankranti root finders")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(2024, 1, 1))
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date(2051, 3, 15))
+    args = parser.parse_args()
+
+    table = sankranti.build_sankranti_table(args.start, args.end)
+    # Search from the calendar's own starting points: sunset of a day 0-30 days after each ingress.
+    jd_ends = [cross_jd + (i * 7) % 31 for i, (_, _, cross_jd) in enumerate(table)]
+
+    swe.calc_ut = counting_calc_ut
+    try:
+        old, old_calls, old_secs = run(bisect_previous_sankranti, jd_ends)
+        new, new_calls, new_secs = run(sankranti.get_previous_sankranti, jd_ends)
+    finally:
+        swe.calc_ut = _calc_ut
+
+    n = len(jd_ends)
+    worst = max(abs(a[0] - b[0]) for a, b in zip(old, new)) * 86400
+    assert all(a[1] == b[1] for a, b in zip(old, new)), "entered signs differ"
+    print(f"{n} sankrantis, {args.start} → {args.end}")
+    print(f"bisection   : {old_calls / n:6.1f} calc_ut/sankranti, {old_secs * 1000 / n:.3f} ms/sankranti")
+    print(f"speed/Newton: {new_calls / n:6.1f} calc_ut/sankranti, {new_secs * 1000 / n:.3f} ms/sankranti")
+    print(f"largest difference between the two: {worst:.1f} s (bisection tolerance is ±13 s)")
+
+
+if __name__ == "__main__":
+    main()
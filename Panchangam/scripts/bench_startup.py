@@ -0,0 +1,62 @@
+#!/Users/user/venv/bin/python
+# Cold-start import cost of solar_calendar.48m.py, from `python -X importtime`.
+# Exits with status 1 when loading the script takes longer than the budget.
+# Usage: python3 bench_startup.py [--budget-ms 100] [--runs 3] [--top 10]
+import argparse
+import os
+import subprocess
+import sys
+
+script_directory = os.path.dirname(os.path.realpath(__file__))
+SCRIPT = os.path.join(script_directory, "solar_calendar.48m.py")
+
+# Load the script as a module (its __main__ block, and so main(), does not run)
+LOAD_SCRIPT = (
+    "import importlib.util as u;"
+    f"s = u.spec_from_file_location('solar_calendar', {SCRIPT!r});"
+    "m = u.module_from_spec(s); s.loader.exec_module(m)"
+)
+
+
+def import_times(code):
+    """{top-level module: cumulative µs} for the imports `python -X importtime -c code` makes"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=script_directory)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not name.startswith("  "):  # top level, not a nested import
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for solar_calendar.48m.py")
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of this many cold starts")
+    parser.add_argument("--top", type=int, default=10, help="list this many of the slowest imports")
+    args = parser.parse_args()
+
+    interpreter = set(import_times("import importlib.util"))  # site, encodings and this loader are not the script's cost
+    best = None
+    for _ in range(args.runs):
+        times = {name: us for name, us in import_times(LOAD_SCRIPT).items() if name not in interpreter}
+        if best is None or sum(times.values()) < sum(best.values()):
+            best = times
+
+    total_ms = sum(best.values()) / 1000
+    for name, us in sorted(best.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{us / 1000:8.1f} ms  {name}")
+    print(f"{total_ms:8.1f} ms  total (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        print("❌ Cold start is over budget")
+        raise SystemExit(1)
+    print("✅ Cold start is within budget")
+
+
+if __name__ == "__main__":
+    main()
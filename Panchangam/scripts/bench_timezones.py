@@ -0,0 +1,48 @@
+#!/Users/user/venv/bin/python
+# Time zone lookups for a batch of birth records: a new TimezoneFinder per record (the old
+# timezone_adjust()) against the shared finder and name cache in timezones.py.
+# Records are drawn from a few hundred towns, as real birth records repeat places.
+# Usage: python3 bench_timezones.py [--records 2000] [--places 300] [--in-memory]
+import argparse
+import random
+import time
+import timezones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TimezoneFinder per record against the shared, cached finder")
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--places", type=int, default=300)
+    parser.add_argument("--old-records", type=int, default=50, help="the old way is slow: timed on this many and scaled")
+    parser.add_argument("--in-memory", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    places = [(rng.uniform(8, 35), rng.uniform(68, 97)) for _ in range(args.places)]
+    records = [rng.choice(places) for _ in range(args.records)]
+
+    from timezonefinder import TimezoneFinder
+    start = time.perf_counter()
+    old = [TimezoneFinder().timezone_at(lng=lon, lat=lat) for lat, lon in records[:args.old_records]]
+    old_seconds = (time.perf_counter() - start) * args.records / min(args.old_records, args.records)
+
+    start = time.perf_counter()
+    timezones.finder(in_memory=args.in_memory)
+    single = [timezones.timezone_at(lat, lon) for lat, lon in records]
+    single_seconds = time.perf_counter() - start
+
+    timezones._timezone_at.cache_clear()
+    start = time.perf_counter()
+    batch = timezones.timezone_at_many(records)
+    batch_seconds = time.perf_counter() - start
+
+    if batch != single or old != single[:len(old)]:
+        raise SystemExit("❌ lookups disagree")
+    print(f"{args.records} records, {args.places} places")
+    print(f"  new TimezoneFinder per record : {old_seconds:8.3f} s (scaled from {len(old)})")
+    print(f"  shared finder + cache         : {single_seconds:8.3f} s (finder creation included)")
+    print(f"  timezone_at_many              : {batch_seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/Users/user/venv/bin/python
+# swe.calc_ut calls per day for tithi and nakshatra ends: the old bisection against the speed/Newton
+# solver in panchanga.py, and the kshaya days the bisection could not show.
+# Usage: python3 bench_transitions.py [--start 2025-01-01] [--days 365]
+import argparse
+import datetime
+import time
+import swisseph as swe
+import panchanga
+from sankranti import get_sun_event_jd, ist_midnight_jd
+
+LAT, LON = 25.3176, 82.9739  # തിഥി_നക്ഷത്ര_വാരം()'s default location
+
+calc_ut_calls = 0
+_calc_ut = swe.calc_ut
+
+
+def counting_calc_ut(*args, **kwargs):
+    global calc_ut_calls
+    calc_ut_calls += 1
+    return _calc_ut(*args, **kwargs)
+
+
+def get_tithi(jd):
+    sun = swe.calc_ut(jd, swe.SUN, flags=swe.FLG_SIDEREAL)[0][0]
+    moon = swe.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
+    return int(((moon - sun) % 360) // 12)
+
+
+def get_nakshatra(jd):
+    moon = swe.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
+    return int((moon % 360) // (360 / 27))
+
+
+def find_transition(start_jd, end_jd, get_value):
+    """The previous solver: bisection for one change of get_value between start_jd and end_jd"""
+    കൃത്യത = 0.0003
+    initial = get_value(start_jd)
+    final = get_value(end_jd)
+    if initial == final:
+        return end_jd
+    for _ in range(20):
+        mid_jd = (start_jd + end_jd) / 2
+        if get_value(mid_jd) == initial:
+            start_jd = mid_jd
+        else:
+            end_jd = mid_jd
+        if (end_jd - start_jd) < കൃത്യത:
+            break
+    return end_jd
+
+
+def bisection(day):
+    sunrise, next_sunrise = day
+    return [find_transition(sunrise, next_sunrise, get_tithi), find_transition(sunrise, next_sunrise, get_nakshatra)]
+
+
+def newton(day):
+    sunrise, next_sunrise = day
+    return [panchanga.tithi_segments(sunrise, next_sunrise), panchanga.nakshatra_segments(sunrise, next_sunrise)]
+
+
+def run(solver, days):
+    global calc_ut_calls
+    calc_ut_calls = 0
+    started = time.perf_counter()
+    results = [solver(day) for day in days]
+    return results, calc_ut_calls, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tithi/nakshatra end-time solvers")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(2025, 1, 1))
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    dates = [args.start + datetime.timedelta(days=i) for i in range(args.days)]
+    days = [(get_sun_event_jd(ist_midnight_jd(date), swe.CALC_RISE, LAT, LON),
+             get_sun_event_jd(ist_midnight_jd(date) + 1, swe.CALC_RISE, LAT, LON)) for date in dates]
+
+    swe.calc_ut = counting_calc_ut
+    try:
+        old, old_calls, old_secs = run(bisection, days)
+        new, new_calls, new_secs = run(newton, days)
+    finally:
+        swe.calc_ut = _calc_ut
+
+    worst = 0.0
+    kshaya = []
+    for date, (_, next_sunrise), old_ends, new_segments in zip(dates, days, old, new):
+        for old_end, segments in zip(old_ends, new_segments):
+            ends = [end for _, end in segments if end < next_sunrise]
+            if len(ends) == 1:
+                worst = max(worst, abs(old_end - ends[0]) * 86400)
+            elif len(ends) > 1:
+                kshaya.append(date)
+    n = len(days)
+    print(f"{n} days from {args.start}, tithi + nakshatra")
+    print(f"bisection   : {old_calls / n:6.1f} calc_ut/day, {old_secs * 1000 / n:.3f} ms/day")
+    print(f"speed/Newton: {new_calls / n:6.1f} calc_ut/day, {new_secs * 1000 / n:.3f} ms/day")
+    print(f"largest difference on days with one end: {worst:.1f} s (bisection tolerance is 26 s)")
+    print(f"days with two ends, where bisection showed one: {len(kshaya)} {[d.isoformat() for d in kshaya[:5]]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import datetime
+import mmap
+import os
+import struct
+from atomic_file import atomic_write
+
+# മലയാളം_gregorian.bin: fixed-width day records, so a date's record sits at a computable offset.
+#   header : magic, epoch (proleptic Gregorian ordinal of the first day), record count
+#   record : day offset from the epoch, കൃഷ്ണവർഷം, sign/month index (0-11), Malayalam day
+MAGIC = b"MLCAL1"
+HEADER = struct.Struct("<6s2xiI")
+RECORD = struct.Struct("<IHBB")
+
+
+def write_calendar_bin(days, output_path):
+    """
+    Write (date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) tuples, one per consecutive date, and return the count.
+    Records are written as they arrive into a temporary file, which replaces output_path only once
+    the header count is filled in, so an interrupted run leaves the previous file as it was.
+    """
+    def write(temp_path):
+        count = 0
+        epoch = None
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 0, 0))
+            for day, ml_year, entered_sign, ml_day in days:
+                if epoch is None:
+                    epoch = day.toordinal()
+                offset = day.toordinal() - epoch
+                if offset != count:
+                    raise ValueError(f"Calendar days must be consecutive: {day} follows day {count - 1} of the file")
+                f.write(RECORD.pack(offset, ml_year, entered_sign, ml_day))
+                count += 1
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, epoch or 0, count))
+        return count
+
+    return atomic_write(output_path, write)
+
+
+def append_calendar_bin(days, path):
+    """
+    Append consecutive day tuples to an existing calendar file and return the new count.
+    The header count is only rewritten (and synced) after the records, so an interrupted
+    append leaves the file at its previous, still valid, length.
+    """
+    with open(path, "r+b") as f:
+        magic, epoch, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Malayalam calendar file")
+        f.seek(HEADER.size + count * RECORD.size)
+        for day, ml_year, entered_sign, ml_day in days:
+            if count == 0 and epoch == 0:
+                epoch = day.toordinal()
+            offset = day.toordinal() - epoch
+            if offset != count:
+                raise ValueError(f"Calendar days must be consecutive: {day} follows day {count - 1} of the file")
+            f.write(RECORD.pack(offset, ml_year, entered_sign, ml_day))
+            count += 1
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, epoch, count))
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+class BinaryCalendar:
+    """Memory-mapped reader for മലയാളം_gregorian.bin; lookup(date) is one unpack at a computed offset."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if empty
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"{path} is not a Malayalam calendar file")
+            magic, self.epoch, self.count = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Malayalam calendar file")
+            if len(self._map) < HEADER.size + self.count * RECORD.size:
+                raise ValueError(f"{path} is truncated")
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def start(self):
+        return datetime.date.fromordinal(self.epoch)
+
+    @property
+    def end(self):
+        return datetime.date.fromordinal(self.epoch + self.count - 1)
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, date):
+        """Return (കൃഷ്ണവർഷം, entered_sign, malayalam_day) for date"""
+        i = date.toordinal() - self.epoch
+        if not 0 <= i < self.count:
+            raise KeyError(f"{date} is outside {self.start} → {self.end}")
+        offset, ml_year, entered_sign, ml_day = RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+        if offset != i:
+            raise ValueError(f"Corrupt record for {date}")
+        return ml_year, entered_sign, ml_day
+
+    def __iter__(self):
+        """(date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) for every day in the file"""
+        for i in range(self.count):
+            offset, ml_year, entered_sign, ml_day = RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+            yield datetime.date.fromordinal(self.epoch + offset), ml_year, entered_sign, ml_day
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,147 @@
+#!/Users/user/venv/bin/python
+import argparse
+import math
+import numpy as np
+import swisseph as swe
+import sankranti  # noqa: F401  sets the Lahiri ayanamsa
+
+# Piecewise Chebyshev fits of the sidereal Sun and Moon longitudes, for bulk work (year-scale
+# sweeps, batch panchanga). Each segment is interpolated at its Chebyshev nodes, so fitting costs
+# degree + 1 swisseph calls per segment, and afterwards any number of instants are evaluated at
+# once with NumPy. The fit uses the ayanamsa set when it is made (Lahiri, through sankranti.py).
+#
+# MAX_ERROR is what the callers may trust with the default segments. The largest error against
+# swe.calc_ut found over 1600-2400 (200,000 instants) was Sun 2.7e-7°, Moon 1.5e-7°; the bounds
+# keep a threefold margin over that:
+#   Sun  : 16-day segments, degree 8  → 1e-6° (0.004″), a crossing off by < 0.1 s
+#   Moon : 8-day segments, degree 14  → 5e-7° (0.002″), a crossing off by < 0.004 s
+# The Moon is worst around 1800-1950, where the tabulated ΔT bends the UT longitude; elsewhere it
+# stays near 1e-8°. `python3 chebyshev.py` re-measures a span against the bounds (default 1600-2400).
+DEFAULTS = {swe.SUN: (16, 8), swe.MOON: (8, 14)}  # body: (segment_days, degree)
+MAX_ERROR = {swe.SUN: 1e-6, swe.MOON: 5e-7}  # degrees
+
+
+def _clenshaw(coefficients, x):
+    """Σ c_j T_j(x) for one row of coefficients per x"""
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    for j in range(coefficients.shape[1] - 1, 0, -1):
+        b1, b2 = 2 * x * b1 - b2 + coefficients[:, j], b1
+    return x * b1 - b2 + coefficients[:, 0]
+
+
+class ChebyshevLongitude:
+    """
+    Sidereal longitude of one body over [jd_start, jd_end], from piecewise Chebyshev polynomials.
+    Calling it with a JD or an array of JDs returns (longitude 0-360, daily speed) like
+    sankranti.sun_longitude(), so it drops into the same solvers.
+    """
+
+    def __init__(self, body, jd_start, jd_end, segment_days=None, degree=None):
+        default_days, default_degree = DEFAULTS.get(body, (4, 14))
+        self.segment_days = segment_days or default_days
+        degree = degree or default_degree
+        n = degree + 1
+        self.jd_start = jd_start
+        self.count = max(1, math.ceil((jd_end - jd_start) / self.segment_days))
+        self.jd_end = jd_start + self.count * self.segment_days
+
+        k = np.arange(n)
+        nodes = np.cos(np.pi * (k + 0.5) / n)
+        self._mids = jd_start + (np.arange(self.count) + 0.5) * self.segment_days
+        jds = self._mids[:, None] + nodes[None, :] * self.segment_days / 2
+        flags = swe.FLG_SIDEREAL
+        longitudes = np.array([[swe.calc_ut(jd, body, flags)[0][0] for jd in row] for row in jds])  # bulk: not through the LRU
+        longitudes = np.unwrap(longitudes, period=360, axis=1)  # continuous within each segment
+
+        # Discrete Chebyshev transform at the nodes
+        self._coefficients = (2 / n) * longitudes @ np.cos(np.pi * np.outer(k + 0.5, k) / n)
+        self._coefficients[:, 0] /= 2
+        # d/dJD = d/dx · 2 / segment_days
+        self._derivative = np.polynomial.chebyshev.chebder(self._coefficients, axis=1) * (2 / self.segment_days)
+
+    def __call__(self, jd):
+        jd_array = np.atleast_1d(np.asarray(jd, dtype=float))
+        if jd_array.min() < self.jd_start or jd_array.max() > self.jd_end:
+            raise ValueError(f"JD outside the fitted range {self.jd_start} → {self.jd_end}")
+        i = np.minimum(((jd_array - self.jd_start) // self.segment_days).astype(int), self.count - 1)
+        x = (jd_array - self._mids[i]) / (self.segment_days / 2)
+        longitude = _clenshaw(self._coefficients[i], x) % 360
+        speed = _clenshaw(self._derivative[i], x)
+        if np.ndim(jd) == 0:
+            return float(longitude[0]), float(speed[0])
+        return longitude, speed
+
+
+def fit_sun_moon(jd_start, jd_end):
+    """Chebyshev fits of the Sun and the Moon over the range, with the default segments"""
+    return ChebyshevLongitude(swe.SUN, jd_start, jd_end), ChebyshevLongitude(swe.MOON, jd_start, jd_end)
+
+
+def limb_angles(sun, moon):
+    """Vectorised (angle, span) for each limb, the same as panchanga.LIMBS but from the fits"""
+    from panchanga import KARANA_SPAN, NAKSHATRA_SPAN, TITHI_SPAN, YOGA_SPAN
+
+    def elongation(jd):
+        (sun_lon, sun_speed), (moon_lon, moon_speed) = sun(jd), moon(jd)
+        return (moon_lon - sun_lon) % 360, moon_speed - sun_speed
+
+    def yoga_angle(jd):
+        (sun_lon, sun_speed), (moon_lon, moon_speed) = sun(jd), moon(jd)
+        return (moon_lon + sun_lon) % 360, moon_speed + sun_speed
+
+    return {
+        "tithi": (elongation, TITHI_SPAN),
+        "nakshatra": (moon, NAKSHATRA_SPAN),
+        "yoga": (yoga_angle, YOGA_SPAN),
+        "karana": (elongation, KARANA_SPAN),
+    }
+
+
+def coarse_segments(jd_start, jd_end, angle, span, step=0.1):
+    """
+    panchanga.segments() for a vectorised angle: sample every `step` days (less than the shortest
+    division, a ~0.4-day karana), find where the division changes, and place every end with
+    Newton steps on all of them at once. Returns [(index, end_jd)], the last one ending after jd_end.
+    """
+    count = round(360 / span)
+    grid = np.arange(jd_start, jd_end + 2 + step, step)  # past jd_end, into the next division
+    values, _ = angle(grid)
+    divisions = (values // span).astype(int) % count
+    changes = np.nonzero(divisions[1:] != divisions[:-1])[0]
+    targets = divisions[changes + 1] * span
+    ends = grid[changes]
+    for _ in range(4):
+        values, speeds = angle(ends)
+        ends = ends + ((targets - values + 180) % 360 - 180) / speeds
+
+    result = [(int(index), float(end)) for index, end in zip(divisions[changes], ends)]
+    last = next(i for i, (_, end) in enumerate(result) if end >= jd_end)
+    return result[:last + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Largest error of the Chebyshev Sun/Moon fits against swisseph")
+    parser.add_argument("--start", type=float, default=2305447.5, help="JD (UT), default 1600-01-01")
+    parser.add_argument("--years", type=float, default=800)
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    jd_end = args.start + args.years * 365.25
+    instants = np.random.default_rng(0).uniform(args.start, jd_end, args.samples)
+    failed = False
+    for name, body in (("Sun", swe.SUN), ("Moon", swe.MOON)):
+        fit = ChebyshevLongitude(body, args.start, jd_end)
+        longitudes, _ = fit(instants)
+        truth = np.array([swe.calc_ut(jd, body, swe.FLG_SIDEREAL)[0][0] for jd in instants])
+        error = np.abs((longitudes - truth + 180) % 360 - 180).max()
+        limit = MAX_ERROR[body]
+        print(f"{name:4}: {error:.1e}° largest error ({error * 3600:.5f}″), bound {limit:.0e}°"
+              f" {'✅' if error <= limit else '❌'}")
+        failed = failed or error > limit
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
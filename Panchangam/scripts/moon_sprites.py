@@ -0,0 +1,196 @@
+import contextlib
+import functools
+import io
+import math
+import os
+import shutil
+from atomic_file import atomic_write
+
+# ചന്ദ്രക്കല sprites: there are only 30 tithis, so every phase icon is drawn once into
+# chart_cache/moon-<key>/NN.png and each refresh just hands out the path (or the bytes).
+# moon_icon_path() instead draws the true phase for the Moon–Sun elongation with NumPy, one icon per
+# ELONGATION_STEP, kept in chart_cache/elongation-<key>/. Pillow and NumPy are only imported to draw.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "chart_cache")
+SPRITE_SIZE = 142  # drawn at this size, then downscaled
+ICON_SIZE = 18  # menu-bar icon
+SHADOW = (51, 51, 51, 178)  # #333333 with ~70% opacity
+SPRITE_VERSION = 1  # bump when draw_moon() draws something different
+ELONGATION_STEP = 0.5  # degrees; icons are drawn for elongations rounded to this
+ELONGATION_VERSION = 1  # bump when draw_moon_elongation() draws something different
+ELONGATION_SUPERSAMPLE = 8  # samples per pixel side
+
+
+def draw_moon(phase, size=SPRITE_SIZE, output_size=ICON_SIZE):
+    """Moon phase image for tithi 0-29, with correct shading for waxing/waning"""
+    from PIL import Image, ImageDraw
+    # Convert phase (0-29) to illumination fraction (0.0-1.0)
+    phase = phase + 1  # to make it from 1 to 30 instead of 0 - 29
+    # Full moon (15) = 1.0, new moon (30) = 0.0
+    illumination = 1 - abs(phase - 15) / 15
+
+    # Determine if waxing (ശുക്ല) or waning (കൃഷ്ണ)
+    waxing = phase < 15
+
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    center = (size // 2, size // 2)
+    radius = size // 2 - 1
+
+    # Draw full white circle (moon)
+    draw.ellipse((center[0] - radius, center[1] - radius,
+                  center[0] + radius, center[1] + radius),
+                 fill='white')
+
+    # Draw shadow based on illumination
+    for y in range(radius):
+        x = round(math.sqrt(radius**2 - y**2))
+
+        if waxing:
+            # Waxing (ശുക്ല): shadow on the LEFT
+            X_left = center[0] - x
+            shade_width = round(2 * x * (1 - illumination))
+            X_right = X_left + shade_width
+        else:
+            # Waning (കൃഷ്ണ): shadow on the RIGHT
+            X_right = center[0] + x
+            shade_width = round(2 * x * (1 - illumination))
+            X_left = X_right - shade_width
+
+        Y_top = center[1] - y
+        Y_bottom = center[1] + y
+
+        if shade_width > 0:
+            draw.line((X_left, Y_top, X_right, Y_top), fill=SHADOW)
+            if Y_top != Y_bottom:
+                draw.line((X_left, Y_bottom, X_right, Y_bottom), fill=SHADOW)
+
+    # Outline
+    draw.ellipse((center[0] - radius, center[1] - radius,
+                  center[0] + radius, center[1] + radius),
+                 outline='white', width=1)
+
+    return img.resize((output_size, output_size), Image.LANCZOS)
+
+
+def sprite_directory(size=SPRITE_SIZE, output_size=ICON_SIZE):
+    """Cache directory for one sprite style; the name changes whenever the style does"""
+    return os.path.join(CACHE_DIR, f"moon-v{SPRITE_VERSION}-{size}-{output_size}-{'-'.join(map(str, SHADOW))}")
+
+
+def build_sprites(size=SPRITE_SIZE, output_size=ICON_SIZE):
+    """Draw all 30 phases into the sprite directory and return it"""
+    directory = sprite_directory(size, output_size)
+    temp_directory = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(temp_directory, exist_ok=True)
+    for tithi in range(30):
+        draw_moon(tithi, size, output_size).save(os.path.join(temp_directory, f"{tithi:02d}.png"),
+                                                 format="PNG", optimize=True, compress_level=9)
+    try:
+        os.rename(temp_directory, directory)  # all 30 appear at once
+    except OSError:  # another refresh finished first
+        shutil.rmtree(temp_directory)
+    _remove_stale("moon-", directory)
+    return directory
+
+
+def _remove_stale(prefix, current):
+    """Delete cache directories drawn for an older style"""
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.startswith(prefix) and path != current and not name.endswith(".tmp"):
+            with contextlib.suppress(FileNotFoundError):
+                shutil.rmtree(path)
+
+
+def moon_sprite_path(tithi, size=SPRITE_SIZE, output_size=ICON_SIZE):
+    """Path of the cached icon for tithi 0-29, drawing the sprites first if they are missing"""
+    if not 0 <= tithi < 30:
+        raise ValueError(f"Tithi must be 0-29, not {tithi}")
+    path = os.path.join(sprite_directory(size, output_size), f"{tithi:02d}.png")
+    if not os.path.exists(path):
+        build_sprites(size, output_size)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def moon_sprite_bytes(tithi, size=SPRITE_SIZE, output_size=ICON_SIZE):
+    """PNG bytes of the icon for tithi 0-29"""
+    with open(moon_sprite_path(tithi, size, output_size), "rb") as f:
+        return f.read()
+
+
+def draw_moon_elongation(elongation, output_size=ICON_SIZE, supersample=ELONGATION_SUPERSAMPLE):
+    """
+    Moon icon for a Moon–Sun elongation in degrees, drawn in one NumPy pass.
+    A row at height y across the disc has half-width w = √(r² − y²); the terminator crosses it at
+    x = w·cos(elongation), so the waxing moon is lit where x > w·cos(e) and the waning moon where
+    x < −w·cos(e). Each pixel averages supersample² samples, in premultiplied alpha.
+    """
+    import numpy as np
+    from PIL import Image
+    n = output_size * supersample
+    c = (np.arange(n) + 0.5) / n * 2 - 1  # sample centres across [-1, 1]
+    x, y = np.meshgrid(c, c)
+    radius = 1 - 2 / SPRITE_SIZE  # size//2 - 1, as in draw_moon()
+    rim = 2 / SPRITE_SIZE  # its 1 px outline
+    r2 = x * x + y * y
+    disc = r2 <= radius**2
+    half_width = np.sqrt(np.clip(radius**2 - y * y, 0, None))
+
+    e = elongation % 360
+    cos_e = math.cos(math.radians(e))
+    lit = x > half_width * cos_e if e < 180 else x < -half_width * cos_e
+    bright = lit | (r2 > (radius - rim)**2)
+
+    alpha = np.where(disc, np.where(bright, 255.0, SHADOW[3]), 0.0)
+    premultiplied = np.where(bright, 255.0, SHADOW[0]) * alpha / 255  # the shadow is a grey
+    alpha = alpha.reshape(output_size, supersample, output_size, supersample).mean(axis=(1, 3))
+    premultiplied = premultiplied.reshape(output_size, supersample, output_size, supersample).mean(axis=(1, 3))
+    grey = np.where(alpha > 0, premultiplied * 255 / np.maximum(alpha, 1e-9), 0)
+
+    pixels = np.empty((output_size, output_size, 4), dtype=np.uint8)
+    pixels[..., :3] = np.rint(grey)[..., None]
+    pixels[..., 3] = np.rint(alpha)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def quantise_elongation(elongation, step=None):
+    """Elongation rounded to the icon step, in [0, 360)"""
+    step = step or ELONGATION_STEP
+    return round(round(elongation % 360 / step) * step % 360, 6)
+
+
+@functools.lru_cache(maxsize=64)
+def moon_icon_bytes(elongation, output_size=ICON_SIZE):
+    """PNG bytes of the icon for an already quantised elongation"""
+    buffer = io.BytesIO()
+    draw_moon_elongation(elongation, output_size).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def moon_icon_path(elongation, output_size=ICON_SIZE, step=None):
+    """
+    Path of the icon for a Moon–Sun elongation in degrees, drawn once per step.
+    Without NumPy this is the tithi sprite instead.
+    """
+    step = step or ELONGATION_STEP
+    directory = os.path.join(CACHE_DIR, f"elongation-v{ELONGATION_VERSION}-{output_size}-{step:g}")
+    quantised = quantise_elongation(elongation, step)
+    path = os.path.join(directory, f"{quantised:07.3f}.png")
+    if os.path.exists(path):
+        return path
+
+    try:
+        data = moon_icon_bytes(quantised, output_size)
+    except ImportError:  # no NumPy
+        return moon_sprite_path(int(elongation % 360 // 12), output_size=output_size)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+        _remove_stale("elongation-", directory)
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            f.write(data)
+
+    atomic_write(path, write)
+    return path
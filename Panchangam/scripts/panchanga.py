@@ -0,0 +1,94 @@
+import swisseph as swe
+import ephemeris
+from sankranti import കൃത്യത
+
+# പഞ്ചാംഗം ends. The Moon–Sun elongation (12° per tithi, 6° per karana), the Moon's longitude
+# (13°20′ per nakshatra) and the Sun + Moon sum (13°20′ per yoga) only ever increase, so the next
+# boundary is predicted from the current speed and polished with Newton steps on the continuous
+# angle, usually three samples in all.
+
+TITHI_SPAN = 12.0
+NAKSHATRA_SPAN = 360 / 27
+YOGA_SPAN = 360 / 27
+KARANA_SPAN = 6.0
+FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+
+def elongation(jd):
+    """Moon − Sun sidereal longitude (0-360) and its daily rate"""
+    sun = ephemeris.calc_ut(jd, swe.SUN, flags=FLAGS)[0]
+    moon = ephemeris.calc_ut(jd, swe.MOON, flags=FLAGS)[0]
+    return (moon[0] - sun[0]) % 360, moon[3] - sun[3]
+
+
+def moon_longitude(jd):
+    """Sidereal longitude of the Moon (0-360) and its daily rate"""
+    moon = ephemeris.calc_ut(jd, swe.MOON, flags=FLAGS)[0]
+    return moon[0] % 360, moon[3]
+
+
+def yoga_angle(jd):
+    """Sun + Moon sidereal longitude (0-360) and its daily rate"""
+    sun = ephemeris.calc_ut(jd, swe.SUN, flags=FLAGS)[0]
+    moon = ephemeris.calc_ut(jd, swe.MOON, flags=FLAGS)[0]
+    return (moon[0] + sun[0]) % 360, moon[3] + sun[3]
+
+
+# (angle, span) of each limb
+LIMBS = {
+    "tithi": (elongation, TITHI_SPAN),
+    "nakshatra": (moon_longitude, NAKSHATRA_SPAN),
+    "yoga": (yoga_angle, YOGA_SPAN),
+    "karana": (elongation, KARANA_SPAN),
+}
+
+
+def crossing(jd, angle, target, sample=None):
+    """
+    (JD (UT), speed) near jd at which angle(jd) reaches target°: a linear prediction from the speed,
+    then Newton steps. sample is angle(jd) when the caller already has it.
+    """
+    value, speed = sample or angle(jd)
+    for _ in range(6):
+        step = ((target - value + 180) % 360 - 180) / speed  # signed, so a slight overshoot steps back
+        jd += step
+        if abs(step) < കൃത്യത:
+            return jd, speed
+        value, speed = angle(jd)
+    raise RuntimeError(f"No convergence towards {target}° near JD {jd}")
+
+
+def segments(jd_start, jd_end, angle, span):
+    """
+    [(index, end_jd)] for every division of `span` degrees that angle passes through from jd_start
+    to jd_end, in order. The last one is still running at jd_end, so its end_jd is after jd_end.
+    """
+    count = round(360 / span)
+    sample = angle(jd_start)
+    index = int(sample[0] // span) % count
+    result = []
+    jd = jd_start
+    while True:
+        target = (index + 1) * span % 360
+        jd, speed = crossing(jd, angle, target, sample)
+        result.append((index, jd))
+        if jd >= jd_end:
+            return result
+        sample = (target, speed)  # where the next prediction starts from
+        index = (index + 1) % count
+
+
+def tithi_segments(jd_start, jd_end):
+    """Tithis (0-29) from jd_start to jd_end with their end times; more than two means a kshaya tithi"""
+    return segments(jd_start, jd_end, elongation, TITHI_SPAN)
+
+
+def nakshatra_segments(jd_start, jd_end):
+    """Nakshatras (0-26) from jd_start to jd_end with their end times"""
+    return segments(jd_start, jd_end, moon_longitude, NAKSHATRA_SPAN)
+
+
+def limb_segments(limb, jd_start, jd_end):
+    """segments() for a limb of LIMBS by name"""
+    angle, span = LIMBS[limb]
+    return segments(jd_start, jd_end, angle, span)
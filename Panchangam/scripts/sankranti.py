@@ -0,0 +1,295 @@
+import bisect
+import datetime
+import swisseph as swe
+import ephemeris
+from sun_table import sun_event_jd
+
+# സംക്രാന്തിപട്ടിക: every Sun sign entry in a date range, with the first day of the
+# Malayalam month it starts. Built once and then looked up per day with bisect.
+
+IST_OFFSET = 5.5  # Hours
+
+# Malayalam month names based on zodiac signs (0-11)
+മാസങ്ങൾ = ["മേടം", "ഇടവം", "മിഥുനം", "കർക്കിടകം", "ചിങ്ങം", "കന്നി", "തുലാം", "വൃശ്ചികം", "ധനു", "മകരം", "കുംഭം", "മീനം"]
+
+ephemeris.set_sid_mode(swe.SIDM_LAHIRI) #Otherwise 25 days shifting
+
+
+def get_sun_event_jd(jd_start_ut, event_type, LAT, LON, ALT=0):
+    """Calculate sunrise/sunset Julian Day with correct API parameters"""
+    geopos = (LON, LAT, ALT)
+    try:
+        result = ephemeris.rise_trans(
+            jd_start_ut,  # Julian day UT
+            swe.SUN,      # Body (Sun)
+            event_type,   # CALC_RISE or CALC_SET
+            geopos,       # (lon, lat, alt)
+            0, 0,         # Atmospheric pressure and temperature
+            swe.FLG_SIDEREAL
+        )
+        ret_code = result[0]  # This should be 0 for success
+        jd_event = result[1][0]  # The first value inside the second tuple
+        if ret_code != 0:
+            raise ValueError(f"Event calculation failed with error code {ret_code}")
+        return jd_event
+    except Exception as e:
+        print(f"[ERROR] Exception in `get_sun_event_jd`: {e}")
+        raise ValueError(f"Error in get_sun_event_jd: {e}")
+
+
+def jd_to_ist(jd_ut):
+    """Convert Julian Day (UT) to IST datetime"""
+    try:
+        dt_utc = swe.revjul(jd_ut, swe.GREG_CAL)
+        if not isinstance(dt_utc, tuple) or len(dt_utc) < 4:
+            raise ValueError(f"[ERROR] Unexpected return from `swe.revjul()`: {dt_utc}")
+
+        year, month, day, decimal_hours = dt_utc
+
+        # Convert decimal hours into Hour, Minute, Second
+        hour = int(decimal_hours)
+        minute = int((decimal_hours - hour) * 60)
+        second = int((((decimal_hours - hour) * 60) - minute) * 60)
+
+        dt_utc = datetime.datetime(year, month, day, hour, minute, second)
+        return dt_utc + datetime.timedelta(hours=5, minutes=30)
+    except Exception as e:
+        print(f"[ERROR] Exception in `jd_to_ist()`: {e}")
+        raise ValueError(f"Error in jd_to_ist(): {e}")
+
+
+def ist_midnight_jd(date):
+    """Julian Day (UT) of 00:00 IST on the given date"""
+    dt_utc = datetime.datetime.combine(date, datetime.time(0, 0)) - datetime.timedelta(hours=IST_OFFSET)
+    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour + dt_utc.minute/60)
+
+
+# The Sun's sidereal daily motion stays between ~0.953°/day and ~1.019°/day and changes by at most
+# ~0.0006°/day per day, so a linear step from a (longitude, speed) sample is bounded on both sides.
+SUN_SPEED_DRIFT = 0.001  # °/day², with margin
+കൃത്യത = 0.0003 #ഒരു വിനാഴിക കൃത്യത
+
+
+def sun_longitude(jd):
+    """Sidereal longitude and daily speed of the Sun"""
+    pos = ephemeris.calc_ut(jd, swe.SUN, flags=swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+    return pos[0], pos[3]
+
+
+def sankranti_brackets(jd_end, longitude=sun_longitude):
+    """
+    Yield ever narrower (low, high, entered_sign) brackets around the Sankranti before jd_end.
+    Each step jumps to the boundary predicted from the Sun's speed (Newton on the continuous longitude).
+    longitude can be a chebyshev.ChebyshevLongitude fit of the Sun for bulk searches.
+    """
+    lon, speed = longitude(jd_end)
+    entered_sign = int(lon // 30)
+    boundary = entered_sign * 30
+    jd = jd_end
+    for _ in range(10):
+        past = (lon - boundary + 180) % 360 - 180  # degrees past the sign boundary
+        step = past / speed
+        slack = SUN_SPEED_DRIFT * abs(step)
+        earliest = jd - past / (speed - slack) if past > 0 else jd - past / (speed + slack)
+        latest = jd - past / (speed + slack) if past > 0 else jd - past / (speed - slack)
+        yield earliest, latest, entered_sign
+        jd -= step
+        lon, speed = longitude(jd)
+    raise RuntimeError("Sankranti solver did not converge")
+
+
+def get_previous_sankranti(jd_end, longitude=sun_longitude):
+    """Find the previous Sankranti (zodiac entry) before the given Julian Day and return (jd_sankranti, entered_sign)"""
+    try:
+        for low, high, entered_sign in sankranti_brackets(jd_end, longitude):
+            if high - low <= കൃത്യത:
+                return (low + high) / 2, entered_sign
+    except Exception as e:
+        raise RuntimeError(f"Error finding sankranti: {e}")
+
+
+def critical_jd(sankranti_date_ist, LAT, LON, ALT=0):
+    """Julian Day at 0.6 of the daylight of the given IST date"""
+    # From a year table already on disk if there is one; a bulk run does not build one per year.
+    try:
+        sk_jd_sunset = sun_event_jd(sankranti_date_ist, swe.CALC_SET, LAT, LON, ALT, build=False)
+        sk_jd_sunrise = sun_event_jd(sankranti_date_ist, swe.CALC_RISE, LAT, LON, ALT, build=False) #സൂര്യോദയം ഉപയോഗിക്കുന്നത് മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം കണക്കാക്കാൻ.
+    except ValueError as e:
+        raise RuntimeError(f"Sunset calculation failed: {e}")
+    return sk_jd_sunrise + 0.6 * (sk_jd_sunset - sk_jd_sunrise) #ഇതാണാ മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം.
+
+
+# How often approximate_sun settled the 0.6 rule from the NOAA times alone vs. needed rise_trans.
+sunrise_stats = {"approximate": 0, "exact": 0}
+
+
+def critical_range(sankranti_date_ist, LAT, LON, ALT=0, approximate_sun=False):
+    """
+    (earliest, latest) JD that jd_critical of the date can be. With approximate_sun this is the NOAA
+    estimate ± its error bound (approximate_sun.py, no swisseph) where that estimate is trusted;
+    otherwise both are critical_jd().
+    """
+    if approximate_sun:
+        try:
+            from approximate_sun import approximate_critical
+            estimate = approximate_critical(sankranti_date_ist, LAT, LON)
+            if estimate is not None:
+                return estimate
+        except ImportError:  # no NumPy
+            pass
+    jd_critical = critical_jd(sankranti_date_ist, LAT, LON, ALT)
+    return jd_critical, jd_critical
+
+
+def sankranti_first_day(cross_jd, LAT, LON, ALT=0, approximate_sun=False):
+    """First day of the month started by the sankranti at cross_jd (0.6 of daylight rule)"""
+    sankranti_date_ist = jd_to_ist(cross_jd).date()
+    earliest, latest = critical_range(sankranti_date_ist, LAT, LON, ALT, approximate_sun)
+    if earliest <= cross_jd < latest:  # too close to call from the estimate
+        earliest = latest = critical_jd(sankranti_date_ist, LAT, LON, ALT)
+        sunrise_stats["exact"] += 1
+    elif approximate_sun:
+        sunrise_stats["approximate"] += 1
+    if cross_jd >= latest:
+        return sankranti_date_ist + datetime.timedelta(days=1)
+    return sankranti_date_ist
+
+
+# How many months decision_only mode settled early vs. had to solve to full വിനാഴിക precision.
+decision_stats = {"decided_early": 0, "full_precision": 0}
+
+
+def _decided_first_day(low, high, LAT, LON, ALT, approximate_sun, critical_by_date):
+    """First day of the month if the bracket (low, high) lies wholly on one side of jd_critical, else None"""
+    sankranti_date_ist = jd_to_ist(low).date()
+    if jd_to_ist(high).date() != sankranti_date_ist:
+        return None  # ഇപ്പോഴും അർദ്ധരാത്രിയുടെ ഇരുവശത്തും
+    if sankranti_date_ist not in critical_by_date:
+        critical_by_date[sankranti_date_ist] = critical_range(sankranti_date_ist, LAT, LON, ALT, approximate_sun)
+    earliest, latest = critical_by_date[sankranti_date_ist]
+    if earliest < latest and low < latest and high >= earliest:  # overlaps the estimate
+        if high - low > latest - earliest:
+            return None  # a narrower bracket may still clear it
+        earliest = latest = critical_jd(sankranti_date_ist, LAT, LON, ALT)
+        critical_by_date[sankranti_date_ist] = earliest, latest
+        sunrise_stats["exact"] += 1
+    if low >= latest:
+        first_day = sankranti_date_ist + datetime.timedelta(days=1)
+    elif high < earliest:
+        first_day = sankranti_date_ist
+    else:
+        return None
+    if approximate_sun and earliest < latest:
+        sunrise_stats["approximate"] += 1
+    return first_day
+
+
+def resolve_sankranti(jd_end, LAT, LON, ALT=0, decision_only=False, approximate_sun=False):
+    """
+    Find the Sankranti before jd_end and the first day of its month: (first_day, entered_sign, cross_jd).
+    With decision_only, refinement stops once the bracket lies wholly on one side of jd_critical
+    (and of IST midnight); cross_jd is then only the bracket midpoint.
+    With approximate_sun, jd_critical starts as a NOAA range and rise_trans is only called when
+    the bracket cannot be placed on one side of that range.
+    """
+    critical_by_date = {}
+    try:
+        for low, high, entered_sign in sankranti_brackets(jd_end):
+            if decision_only:
+                first_day = _decided_first_day(low, high, LAT, LON, ALT, approximate_sun, critical_by_date)
+                if first_day is not None:
+                    decision_stats["decided_early"] += 1
+                    return first_day, entered_sign, (low + high) / 2
+            if high - low <= കൃത്യത:
+                if decision_only:  # still across jd_critical or IST midnight at a വിനാഴിക
+                    decision_stats["full_precision"] += 1
+                cross_jd = (low + high) / 2
+                return sankranti_first_day(cross_jd, LAT, LON, ALT, approximate_sun), entered_sign, cross_jd
+    except Exception as e:
+        raise RuntimeError(f"Failed to find Sankranti: {e}")
+
+
+def build_sankranti_table(start_date, end_date, LAT=10.7867, LON=76.6548, ALT=0, decision_only=False,
+                          approximate_sun=False):
+    """
+    Every sankranti whose month covers a day in [start_date, end_date], oldest first.
+    Returns a list of (first_day, entered_sign, cross_jd) tuples for lookup_malayalam_date().
+    approximate_sun settles the 0.6 rule from NumPy NOAA sunrise times where they are clear enough.
+    """
+    table = []
+    jd = ist_midnight_jd(end_date + datetime.timedelta(days=1))
+    while True:
+        first_day, entered_sign, cross_jd = resolve_sankranti(jd, LAT, LON, ALT, decision_only, approximate_sun)
+        table.append((first_day, entered_sign, cross_jd))
+        if first_day <= start_date:
+            break
+        jd = cross_jd - 20  # took back few days.
+    table.reverse()
+    return table
+
+
+def sankranti_instants(start_date, end_date):
+    """
+    Every sankranti (cross_jd, entered_sign) whose month can cover a day in [start_date, end_date],
+    oldest first, solved to a വിനാഴിക. They do not depend on the place, so one list serves many.
+    """
+    instants = []
+    jd = ist_midnight_jd(end_date + datetime.timedelta(days=1))
+    while True:
+        cross_jd, entered_sign = get_previous_sankranti(jd)
+        instants.append((cross_jd, entered_sign))
+        if jd_to_ist(cross_jd).date() < start_date:  # its month starts by start_date wherever the place is
+            break
+        jd = cross_jd - 20
+    instants.reverse()
+    return instants
+
+
+def location_sankranti_table(instants, LAT, LON, ALT=0, approximate_sun=False):
+    """build_sankranti_table() for one place from shared sankranti_instants(): only the 0.6 rule is local"""
+    return [(sankranti_first_day(cross_jd, LAT, LON, ALT, approximate_sun), entered_sign, cross_jd)
+            for cross_jd, entered_sign in instants]
+
+
+def krishna_year(first_day, entered_sign):
+    """കൃഷ്ണവർഷം of a month from its first day and sign (മേടം 1 starts the year)"""
+    # greg_year സൗരമാസം തുടക്കാനുസൃതമാണ്, അതിനാൽ ധനുവിന് വേറെയായ് കൈകാര്യം ചെയ്യേണ്ട.
+    if entered_sign < 9:  # മേടം(0) തൊട്ട് ധനു (8) വരെ.
+        return first_day.year + 3102
+    return first_day.year + 3101  # മകരം(9) to മീനം(11)
+
+
+def lookup_malayalam_date(table, input_date):
+    """Return (കൃഷ്ണവർഷം, entered_sign, malayalam_day) for input_date from a sankranti table"""
+    i = bisect.bisect_right(table, (input_date, len(മാസങ്ങൾ))) - 1
+    if i < 0:
+        raise ValueError(f"{input_date} is before the sankranti table")
+    first_day, entered_sign, _ = table[i]
+    malayalam_day = (input_date - first_day).days + 1
+    if malayalam_day > 32:
+        raise ValueError(f"{input_date} is after the sankranti table")
+    return krishna_year(first_day, entered_sign), entered_sign, malayalam_day
+
+
+def iter_calendar_days(table, start_date, end_date):
+    """
+    Yield (date, കൃഷ്ണവർഷം, entered_sign, malayalam_day) for every day in [start_date, end_date].
+    Each month is resolved once from the table and its days are filled arithmetically.
+    """
+    if not table or table[0][0] > start_date:
+        raise ValueError(f"{start_date} is before the sankranti table")
+    one_day = datetime.timedelta(days=1)
+    for i, (first_day, entered_sign, _) in enumerate(table):
+        if i + 1 < len(table):
+            last_day = table[i + 1][0] - one_day
+        else:
+            last_day = end_date
+        if last_day < start_date:
+            continue
+        year = krishna_year(first_day, entered_sign)
+        day = max(first_day, start_date)
+        while day <= min(last_day, end_date):
+            yield day, year, entered_sign, (day - first_day).days + 1
+            day += one_day
+        if last_day >= end_date:
+            return
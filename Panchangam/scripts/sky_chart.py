@@ -0,0 +1,257 @@
+import contextlib
+import functools
+import hashlib
+import json
+import math
+import os
+import PIL
+from PIL import Image, ImageColor, ImageDraw, ImageFont, features
+from atomic_file import atomic_write
+
+# ജ്യോതിഷനില ചിത്രം directly with Pillow: the same sky map generate_chart() builds with plotly
+# (rashi and nakshatra rings, graha markers with halos, lagna, title) without starting kaleido's
+# headless browser. Sizes and colours follow the plotly figure, so both backends look alike.
+
+SIZE = 500  # px, like the plotly layout
+MARGIN = 20
+RADIAL_MAX = 1.5  # radialaxis range
+ROTATION = 120  # angularaxis rotation: 0° of the zodiac sits at 120°, counted clockwise
+SUPERSAMPLE = 2  # draw at 2× and downscale, for smooth edges
+
+# The static layer is drawn once and kept in CACHE_DIR as background-<style key>.png
+CACHE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "chart_cache")
+BACKGROUND_VERSION = 2  # bump when draw_background() draws something different
+
+RASHIS = ['മേടം', 'ഇടവം', 'മിഥുനം', 'കർക്കിടകം', 'ചിങ്ങം', 'കന്നി',
+          'തുലാം', 'വൃശ്ചികം', 'ധനു', 'മകരം', 'കുംഭം', 'മീനം']
+
+NAKSHATRAS = [
+    'അശ്വതി', 'ഭരണി', 'കാർത്തിക', 'രോഹിണി', 'മകയിരം', 'തിരുവാതിര',
+    'പുണർത്ഥം', 'പൂയം', 'ആയില്യം', 'മകം', 'പൂരം', 'ഉത്രം',
+    'അത്തം', 'ചിത്ര', 'ചോതി', 'വിശാഖം', 'അനിഴം', 'തൃക്കേട്ട',
+    'മൂലം', 'പൂരാടം', 'ഉത്രാടം', 'തിരുവോണം', 'അവിട്ടം', 'ചതയം',
+    'പൂരുരുട്ടാതി', 'ഉത്രട്ടാതി', 'രേവതി'
+]
+
+PLANET_COLORS = {
+    "രവി": "#FF6B35",       # Sunset Orange
+    "ചന്ദ്ര": "#F4F4F8",     # Moon White
+    "കുജ": "#D62828",       # Mars Red
+    "ബുധ": "#06D6A0",       # Mercury Teal
+    "ഗുരു": "#FFD166",       # Jupiter Gold
+    "ശുക്ര": "#C4C4C4",      # Venus Silver
+    "മന്ദ": "#2B2D42",       # Saturn Navy
+    "സർപ്പി": "#2323FF",    # Rahu Cyan
+    "ശിഖി": "#7B7B7C",       # Ketu Graphite
+    "ലഗ്നം": "#FF007F"       # Lagna Pink
+}
+
+NAKSHATRA_FILLS = [(76, 201, 240, 38), (255, 255, 255, 20)]  # rgba(76,201,240,0.15) / rgba(255,255,255,0.08)
+NAKSHATRA_TEXT = ['#4CC9F0', '#4DC0F0']
+RASHI_TEXT = '#cfa1a0'
+TITLE_TEXT = '#FFD166'
+TICK_TEXT = '#444444'
+GRID = (255, 255, 255, 26)  # rgba(255,255,255,0.1)
+AXIS_LINE = (255, 255, 255, 51)  # rgba(255,255,255,0.2)
+RING = (255, 255, 255, 13)  # rgba(255,255,255,0.05)
+
+# Noto Sans Malayalam, as in the plotly figure, wherever it is installed; then macOS's own Malayalam fonts
+FONT_CANDIDATES = {
+    "bold": [
+        "~/Library/Fonts/NotoSansMalayalam-Bold.ttf",
+        "/Library/Fonts/NotoSansMalayalam-Bold.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSansMalayalam-Bold.ttf",
+        "~/Library/Fonts/NotoSansMalayalam[wdth,wght].ttf",
+        "/Library/Fonts/NotoSansMalayalam[wdth,wght].ttf",
+        "/System/Library/Fonts/Supplemental/Malayalam Sangam MN.ttc",
+        "/System/Library/Fonts/Supplemental/Malayalam MN.ttc",
+    ],
+    "regular": [
+        "~/Library/Fonts/NotoSansMalayalam-Regular.ttf",
+        "/Library/Fonts/NotoSansMalayalam-Regular.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSansMalayalam-Regular.ttf",
+        "~/Library/Fonts/NotoSansMalayalam[wdth,wght].ttf",
+        "/Library/Fonts/NotoSansMalayalam[wdth,wght].ttf",
+        "/System/Library/Fonts/Supplemental/Malayalam Sangam MN.ttc",
+        "/System/Library/Fonts/Supplemental/Malayalam MN.ttc",
+    ],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def font_path(weight="bold"):
+    """First installed font for the weight, or None for Pillow's built-in font"""
+    for candidate in FONT_CANDIDATES[weight]:
+        path = os.path.expanduser(candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size, weight="bold"):
+    path = font_path(weight)
+    if path is None:
+        return ImageFont.load_default(size)
+    # Malayalam conjuncts need complex text layout when Pillow has it
+    layout = ImageFont.Layout.RAQM if features.check("raqm") else ImageFont.Layout.BASIC
+    return ImageFont.truetype(path, size, layout_engine=layout)
+
+
+def _point(r, theta, scale):
+    """Pixel position of polar (r, θ°) on the chart"""
+    angle = math.radians(ROTATION - theta)
+    radius = r / RADIAL_MAX * (SIZE / 2 - MARGIN) * scale
+    return SIZE * scale / 2 + radius * math.cos(angle), SIZE * scale / 2 - radius * math.sin(angle)
+
+
+def _circle(draw, center, diameter, **kwargs):
+    x, y = center
+    draw.ellipse((x - diameter / 2, y - diameter / 2, x + diameter / 2, y + diameter / 2), **kwargs)
+
+
+def _rgba(color, alpha):
+    return ImageColor.getrgb(color)[:3] + (round(alpha * 255),)
+
+
+@contextlib.contextmanager
+def _layer(img, box=None, scratch=None):
+    """
+    ImageDraw on an RGBA image replaces the pixels under a translucent fill instead of blending
+    them, so each layer of the chart is drawn on a transparent image and alpha-composited onto img,
+    as plotly stacks its layers. With box, only that region is composited, and a transparent
+    scratch image of img's size can be reused: the region is cleared again afterwards.
+    """
+    layer = scratch if scratch is not None and box is not None else Image.new('RGBA', img.size, (0, 0, 0, 0))
+    yield ImageDraw.Draw(layer)
+    if box is None:
+        img.alpha_composite(layer)
+        return
+    left, top = max(0, math.floor(box[0])), max(0, math.floor(box[1]))
+    right, bottom = min(img.width, math.ceil(box[2])), min(img.height, math.ceil(box[3]))
+    if left < right and top < bottom:
+        img.alpha_composite(layer, dest=(left, top), source=(left, top, right, bottom))
+        layer.paste((0, 0, 0, 0), (left, top, right, bottom))
+
+
+def _circle_box(center, diameter):
+    x, y = center
+    return x - diameter / 2 - 1, y - diameter / 2 - 1, x + diameter / 2 + 1, y + diameter / 2 + 1
+
+
+def _text_box(font, position, text, anchor):
+    left, top, right, bottom = font.getbbox(text, anchor=anchor)
+    return position[0] + left - 1, position[1] + top - 1, position[0] + right + 1, position[1] + bottom + 1
+
+
+def draw_background(scale=SUPERSAMPLE):
+    """The parts of the chart that never change: rings, grid, tick, rashi and nakshatra labels"""
+    img = Image.new('RGBA', (SIZE * scale, SIZE * scale), (0, 0, 0, 0))
+    center = (SIZE * scale / 2, SIZE * scale / 2)
+
+    # Celestial background circle (paper 0.45-0.55) and the polar frame
+    with _layer(img) as draw:
+        _circle(draw, center, 0.1 * SIZE * scale, outline=(255, 255, 255, 26), width=2 * scale)
+    with _layer(img) as draw:
+        _circle(draw, center, 2 * (SIZE / 2 - MARGIN) * scale, outline=AXIS_LINE, width=scale)
+
+    # Angular grid every 30°, with the plotly tick labels just outside the frame
+    tick_font = load_font(12 * scale, "regular")
+    with _layer(img) as draw:
+        for theta in range(0, 360, 30):
+            draw.line((center, _point(RADIAL_MAX, theta, scale)), fill=GRID, width=scale)
+    with _layer(img) as draw:
+        for theta in range(0, 360, 30):
+            draw.text(_point(RADIAL_MAX * 1.06, theta, scale), str(theta), fill=TICK_TEXT, font=tick_font, anchor="mm")
+
+    # Nakshatra outer ring (27 sectors, alternating fill); the sectors do not overlap each other
+    nakshatra_angle = 360 / 27
+    with _layer(img) as draw:
+        for i in range(27):
+            start, end = i * nakshatra_angle, (i + 1) * nakshatra_angle
+            draw.polygon([_point(1.3, start, scale), _point(1.45, start, scale),
+                          _point(1.45, end, scale), _point(1.3, end, scale)], fill=NAKSHATRA_FILLS[i % 2])
+
+    # Constellation line
+    with _layer(img) as draw:
+        _circle(draw, center, 2 * (SIZE / 2 - MARGIN) * scale, outline=RING, width=scale)
+
+    nakshatra_font = load_font(10 * scale)
+    rashi_font = load_font(11 * scale)
+    with _layer(img) as draw:
+        for i, name in enumerate(NAKSHATRAS):
+            draw.text(_point(1.47, i * nakshatra_angle + nakshatra_angle / 2, scale), name,
+                      fill=NAKSHATRA_TEXT[i % 2], font=nakshatra_font, anchor="mm")
+        for i, name in enumerate(RASHIS):
+            draw.text(_point(1.15, i * 30 + 15, scale), name, fill=RASHI_TEXT, font=rashi_font, anchor="mm")
+    return img
+
+
+def style_key():
+    """Hash of everything the background layer depends on: geometry, labels, colours, fonts and Pillow"""
+    fonts = {}
+    for weight in FONT_CANDIDATES:
+        path = font_path(weight)
+        fonts[weight] = path and [path, os.path.getsize(path), os.path.getmtime(path)]
+    style = {
+        "version": BACKGROUND_VERSION, "size": SIZE, "margin": MARGIN, "radial_max": RADIAL_MAX,
+        "rotation": ROTATION, "supersample": SUPERSAMPLE, "rashis": RASHIS, "nakshatras": NAKSHATRAS,
+        "colors": [NAKSHATRA_FILLS, NAKSHATRA_TEXT, RASHI_TEXT, TICK_TEXT, GRID, AXIS_LINE, RING],
+        "fonts": fonts, "pillow": PIL.__version__, "raqm": features.check("raqm"),
+    }
+    return hashlib.sha256(json.dumps(style, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=2)
+def _load_background(key):
+    path = os.path.join(CACHE_DIR, f"background-{key}.png")
+    try:
+        with Image.open(path) as img:
+            img.load()
+            return img
+    except OSError:  # missing or unreadable: draw it again
+        pass
+
+    img = draw_background()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):  # layers drawn for an older style
+        if name.startswith("background-") and name.endswith(".png") and name != os.path.basename(path):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(CACHE_DIR, name))
+    atomic_write(path, lambda temp_path: img.save(temp_path, format="PNG", compress_level=1))
+    return img
+
+
+def cached_background():
+    """The background layer for the current style, from memory, then disk, then drawn afresh"""
+    return _load_background(style_key())
+
+
+def draw_markers(img, positions, title, scale=SUPERSAMPLE):
+    """Graha markers with halos, lagna and the title, drawn over a background layer"""
+    label_font = load_font(12 * scale)
+    scratch = Image.new('RGBA', img.size, (0, 0, 0, 0))
+    for planet, data in positions.items():
+        color = PLANET_COLORS[planet]
+        center = _point(0.7, data['longitude'] % 360, scale)
+        with _layer(img, _circle_box(center, 20 * scale), scratch) as draw:
+            _circle(draw, center, 20 * scale, fill=color, outline=(255, 255, 255, 128), width=2 * scale)
+        label = (center[0] + 12 * scale, center[1])
+        with _layer(img, _text_box(label_font, label, planet, "lm"), scratch) as draw:
+            draw.text(label, planet, fill=color, font=label_font, anchor="lm")
+        with _layer(img, _circle_box(center, 28 * scale), scratch) as draw:  # Halo effect, a trace after the marker in plotly
+            _circle(draw, center, 28 * scale, fill=_rgba(color, 0.15))
+
+    title_font = load_font(16 * scale)
+    title_position = (SIZE * scale / 2, 0.05 * SIZE * scale)
+    with _layer(img, _text_box(title_font, title_position, title, "mm"), scratch) as draw:
+        draw.text(title_position, title, fill=TITLE_TEXT, font=title_font, anchor="mm")
+    return img
+
+
+def draw_chart(positions, title, image_path):
+    """Render the sky map for `positions` ({name: {"longitude": °}}) to image_path and return the path"""
+    img = draw_markers(cached_background().copy(), positions, title)
+    img = img.reduce(SUPERSAMPLE)  # box-filter the 2× drawing down; much cheaper than LANCZOS
+    img.save(image_path, format="PNG", compress_level=1)
+    return image_path
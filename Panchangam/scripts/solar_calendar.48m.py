@@ -1,20 +1,29 @@
 #!/Users/user/venv/bin/python
 # Change the above line to your Python environment and leave blank if you have no virtual environment
 
+import argparse
+import contextlib
 import datetime
+import io
 import sys
 import swisseph as swe
+import ephemeris
 import os
-import subprocess
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-from PIL import Image, ImageDraw
+from sankranti import മാസങ്ങൾ, build_sankranti_table, decision_stats, lookup_malayalam_date
+from sun_table import sun_event_jd
+from panchanga import nakshatra_segments, tithi_segments
+from transition_table import TransitionTable
 import base64
 from io import BytesIO
 import time
 import math
+# geopy, PIL, plotly, timezonefinder, pytz, socketserver and subprocess are imported where they are used, so the
+# menu text is printed before any of them load. bench_startup.py keeps the cold start within budget.
 
 DEBUG_MODE = False  # Set to True to enable debug prints
+ചാർട്ട്_രീതി = "plotly"  # "pillow" draws the chart with sky_chart.py, without kaleido's headless browser (the daemon's default)
+സ്ഥിരസേവനം = False  # True while answering refreshes in daemon mode (--serve / --socket)
+ഓൺലൈൻ_സ്ഥലം = True  # places not in gazetteer.csv are asked of Nominatim; False keeps custom places offline
 
 def dprint(*args, **kwargs):
     if DEBUG_MODE:
@@ -35,289 +44,46 @@ def get_user_input():
 def മലയാളദിനം(input_date=None, LAT=10.7867, LON=76.6548): # Constants for Palakkad, Kerala
     if input_date is None:
         input_date = datetime.date.today()
-    ALT = 0  # Meters
-    IST_OFFSET = 5.5  # Hours
-
-    # Malayalam month names based on zodiac signs (0-11)
-    മാസങ്ങൾ = ["മേടം", "ഇടവം","മിഥുനം", "കർക്കിടകം","ചിങ്ങം", "കന്നി", "തുലാം", "വൃശ്ചികം", "ധനു","മകരം","കുംഭം", "മീനം"]
-    
-    swe.set_sid_mode(swe.SIDM_LAHIRI) #Otherwise 25 days shifting
-
-    def get_sun_event_jd(jd_start_ut, event_type):
-        """Calculate sunrise/sunset Julian Day with correct API parameters"""
-        geopos = (LON, LAT, ALT)
-        try:
-            # Call rise_trans and get the full result
-            result = swe.rise_trans(
-                jd_start_ut,  # Julian day UT
-                swe.SUN,      # Body (Sun)
-                event_type,   # CALC_RISE or CALC_SET
-                geopos,       # (lon, lat, alt)
-                0, 0,         # Atmospheric pressure and temperature
-                swe.FLG_SIDEREAL
-            )            
-
-            # ✅ Extract the correct values
-            ret_code = result[0]  # This should be 0 for success
-            jd_event = result[1][0]  # The first value inside the second tuple            
-
-            # ✅ Ensure function call was successful
-            if ret_code != 0:
-                raise ValueError(f"Event calculation failed with error code {ret_code}")
-
-            return jd_event
-        except Exception as e:
-            print(f"[ERROR] Exception in `get_sun_event_jd`: {e}")
-            raise ValueError(f"Error in get_sun_event_jd: {e}")
-
-
-    def jd_to_ist(jd_ut):
-        """Convert Julian Day (UT) to IST datetime"""
-        try:
-            dt_utc = swe.revjul(jd_ut, swe.GREG_CAL)           
-            if not isinstance(dt_utc, tuple) or len(dt_utc) < 4:
-                raise ValueError(f"[ERROR] Unexpected return from `swe.revjul()`: {dt_utc}")
-
-            year, month, day, decimal_hours = dt_utc
-
-            # Convert decimal hours into Hour, Minute, Second
-            hour = int(decimal_hours)
-            minute = int((decimal_hours - hour) * 60)
-            second = int((((decimal_hours - hour) * 60) - minute) * 60)
-
-            dt_utc = datetime.datetime(year, month, day, hour, minute, second)
-            dt_ist = dt_utc + datetime.timedelta(hours=5, minutes=30)
-            
-            return dt_ist
-
-        except Exception as e:
-            print(f"[ERROR] Exception in `jd_to_ist()`: {e}")
-            raise ValueError(f"Error in jd_to_ist(): {e}")
-
-    def get_previous_sankranti(jd_end):
-        """Find the previous Sankranti (zodiac entry) before the given Julian Day and return (jd_sankranti, entered_sign)"""
-        കൃത്യത = 0.0003 #ഒരു വിനാഴിക കൃത്യത 
-        # Check for sankranti in the interval [jd_end - 1, jd_end]
-        
-        def find_crossing(jd_low, jd_high, sign_low):
-            """Helper for binary search between two points"""
-            low, high = jd_low, jd_high
-            while high - low > കൃത്യത:
-                mid = (low + high) / 2
-                sun_pos = swe.calc_ut(mid, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign_mid = int(sun_pos[0][0] // 30)
-            
-                if sign_mid == sign_low:
-                    low = mid
-                else:
-                    high = mid
-            return (low + high) / 2
-        
-        try:
-            sun_pos_before = swe.calc_ut(jd_end - 1.0, swe.SUN, flags=swe.FLG_SIDEREAL)
-            sign_before = int(sun_pos_before[0][0] // 30)
-            sun_pos_after = swe.calc_ut(jd_end, swe.SUN, flags=swe.FLG_SIDEREAL)
-            sign_after = int(sun_pos_after[0][0] // 30)
-
-            if sign_before != sign_after:
-                cross_jd = find_crossing(jd_end - 1.0, jd_end, sign_before)
-                return cross_jd, sign_after
-        except Exception as e:
-            raise RuntimeError(f"Error checking for sankranti: {e}")
-
-        # Search backward in time (up to 40 days)
-        for i in range(1, 41):
-            try:
-                jd_start = jd_end - (i + 1)
-                jd_mid = jd_end - i
-            
-                sun_pos_1 = swe.calc_ut(jd_start, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign1 = int(sun_pos_1[0][0] // 30)
-                sun_pos_2 = swe.calc_ut(jd_mid, swe.SUN, flags=swe.FLG_SIDEREAL)
-                sign2 = int(sun_pos_2[0][0] // 30)
-
-                if sign1 != sign2:
-                    cross_jd = find_crossing(jd_start, jd_mid, sign1)
-                    return cross_jd, sign2
-            except Exception as e:
-                raise RuntimeError(f"Error during backward search: {e}")
-
-        raise RuntimeError("No sankranti found within 40 days")
-
-    # Convert input_date to UTC midnight to find sunrise
-    dt_ist = datetime.datetime.combine(input_date, datetime.time(0, 0))
-    dt_utc = dt_ist - datetime.timedelta(hours=IST_OFFSET)
-    jd_start = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour + dt_utc.minute/60)
-
-    try:
-        # Sunrise on input_date (start of Malayalam day)
-        jd_sunrise = get_sun_event_jd(jd_start, swe.CALC_RISE)
-        jd_sunset =  get_sun_event_jd(jd_start, swe.CALC_SET)
-    except ValueError as e:
-        raise RuntimeError(f"Sunrise calculation failed: {e}")
-
 
-    # Find previous Sankranti and the entered sign
+    # Sankranti and the first day of its month come from the shared solver in sankranti.py
     try:
-        cross_jd, entered_sign = get_previous_sankranti(jd_sunset)
-        sankranti_ist = jd_to_ist(cross_jd)
-        sankranti_date_ist = sankranti_ist.date()
+        # Only whether the sankranti falls before or after the 0.6 point matters here, not its exact instant.
+        സംക്രാന്തിപട്ടിക = build_sankranti_table(input_date, input_date, LAT, LON, decision_only=True)
+        കൃഷ്ണവർഷം, entered_sign, malayalam_day = lookup_malayalam_date(സംക്രാന്തിപട്ടിക, input_date)
+        malayalam_month = മാസങ്ങൾ[entered_sign]
+        dprint(f"[DEBUG] Sankranti decisions: {decision_stats}")
     except Exception as e:
         raise RuntimeError(f"Failed to find Sankranti: {e}")
 
-    # Get sunrise and sunset on Sankranti's local date
-    sk_dt_ist = datetime.datetime.combine(sankranti_date_ist, datetime.time(0, 0))
-    sk_dt_utc = sk_dt_ist - datetime.timedelta(hours=IST_OFFSET)
-    sk_jd_start = swe.julday(sk_dt_utc.year, sk_dt_utc.month, sk_dt_utc.day, sk_dt_utc.hour)
-
     try:
-        sk_jd_sunset = get_sun_event_jd(sk_jd_start, swe.CALC_SET)
-        sk_jd_sunrise = get_sun_event_jd(sk_jd_start, swe.CALC_RISE) #സൂര്യോദയം ഉപയോഗിക്കുന്നത് മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം കണക്കാക്കാൻ.
+        # Sunrise on input_date (start of Malayalam day)
+        jd_sunrise = sun_event_jd(input_date, swe.CALC_RISE, LAT, LON)
     except ValueError as e:
-        raise RuntimeError(f"Sunset calculation failed: {e}")
-
-    jd_critical = sk_jd_sunrise + 0.6 * (sk_jd_sunset - sk_jd_sunrise) #ഇതാണാ മലയാളപഞ്ചാംഗത്തിന്റെ പ്രത്യേക നിയമം.
-
-    # Adjust first day based on critical time
-    if cross_jd >= jd_critical: #ഇതിന് മുമ്പ് സൂര്യാസ്തമയം മാത്രമായിരുന്നു ഉപയോഗിച്ചിരുന്നത്. അത് പോര.
-        first_day = sankranti_date_ist + datetime.timedelta(days=1)
-    else:
-        first_day = sankranti_date_ist
-
-    # ====== EDGE CASE HANDLER ======
-    if input_date < first_day:
-        # This is the last day of the previous month
-        # Calculate the start of the previous month
-        prev_sankranti_jd = cross_jd - 20  # took back few days.
-        prev_cross_jd, prev_entered_sign = get_previous_sankranti(prev_sankranti_jd)
-        prev_sankranti_ist = jd_to_ist(prev_cross_jd).date()
-        
-        # Get critical time for previous sankranti
-        prev_sk_dt_ist = datetime.datetime.combine(prev_sankranti_ist, datetime.time(0, 0))
-        prev_sk_dt_utc = prev_sk_dt_ist - datetime.timedelta(hours=IST_OFFSET)
-        prev_sk_jd_start = swe.julday(prev_sk_dt_utc.year, prev_sk_dt_utc.month, 
-                                     prev_sk_dt_utc.day, prev_sk_dt_utc.hour)
-        
-        prev_sk_jd_sunrise = get_sun_event_jd(prev_sk_jd_start, swe.CALC_RISE)
-        prev_sk_jd_sunset = get_sun_event_jd(prev_sk_jd_start, swe.CALC_SET)
-        prev_jd_critical = prev_sk_jd_sunrise + 0.6 * (prev_sk_jd_sunset - prev_sk_jd_sunrise)
-        
-        # Determine first day of previous month
-        if prev_cross_jd >= prev_jd_critical:
-            prev_first_day = prev_sankranti_ist + datetime.timedelta(days=1)
-        else:
-            prev_first_day = prev_sankranti_ist
-        
-        # Calculate actual day number in previous month
-        malayalam_day = (input_date - prev_first_day).days + 1
-        malayalam_month = മാസങ്ങൾ[prev_entered_sign]
-        
-        # Adjust year for previous month
-        if prev_entered_sign < 9:  # Medam to Dhanu
-            കൃഷ്ണവർഷം = prev_first_day.year + 3102
-        else:  # Makaram to Meenam
-            കൃഷ്ണവർഷം = prev_first_day.year + 3101
-        
-        return f"{കൃഷ്ണവർഷം} {malayalam_month} {malayalam_day:02d}"
-    # ====== END EDGE HANDLER ======
-
-    # Calculate Malayalam day number
-    malayalam_day = (input_date - first_day).days + 1
+        raise RuntimeError(f"Sunrise calculation failed: {e}")
 
-    # Get month name from entered_sign
-    malayalam_month = മാസങ്ങൾ[entered_sign]
-    
-    greg_year = first_day.year
-    #greg_month = input_date.month
-    
-    # കൊല്ലവർഷം കണക്കാക്കൽ (ചിങ്ങം 1)
-    #if entered_sign >= 4 and entered_sign < 9:  # ചിങ്ങം(4) തൊട്ട് ധനു (7) വരെ.
-    #    കൊല്ലവർഷം = greg_year - 824
-    #else:  # Medam(0) to Karkidakam(3) or Meenam(9) to Medam(11)
-    #    കൊല്ലവർഷം = greg_year - 825
-    
-    # കൃഷ്ണവർഷം കണക്കാക്കൽ (മേടം 1)
-    if entered_sign >= 0 and entered_sign < 9:  # മേടം(0) തൊട്ട് ധനു (7) വരെ. ധനുവിന് വേറെയായ് കൈകാര്യം ചെയ്യേണ്ട ആവശ്യമില്ല, എന്തെന്നാൽ greg_year കണക്കാകപെടുക സൗരമാസം തുടക്കാനുസൃതമാണ്. അത് Dec15 തന്നെയാണ് കാണിക്കുക, January മാസദിനമാണെങ്കിൽ പോലും.
-        കൃഷ്ണവർഷം = greg_year + 3102
-    else:  # മകരം(9) to മീനം(11)
-        കൃഷ്ണവർഷം = greg_year + 3101
-    
-    #ചന്ദ്രനെ വരക്കുന്നു. ആദ്യം Get tithi at sunrise
-    current_tithi = get_tithi(jd_sunrise)
-    #dprint(f"[DEBUG] Tithi/phase: {current_tithi}") 
-    moon_path = generate_moon_image(current_tithi)
+    #ചന്ദ്രനെ വരക്കുന്നു. ആദ്യം Get the Moon–Sun elongation at sunrise
+    elongation = get_elongation(jd_sunrise)
+    #dprint(f"[DEBUG] Elongation: {elongation}") 
+    moon_path = generate_moon_image(elongation)
     #return f"{'     　 : '} {കൃഷ്ണവർഷം} {malayalam_month} {malayalam_day:02d} | image={moon_image}\n" #no space comes before year if something like ":" is not used.
     സമ്പൂർണമലയാളദിനം = f"{കൃഷ്ണവർഷം} {malayalam_month} {malayalam_day:02d}"
     return സമ്പൂർണമലയാളദിനം, moon_path
 
 
+def get_elongation(jd):
+    """Moon–Sun elongation in degrees (0-360) at a Julian date"""
+    sun = ephemeris.calc_ut(jd, swe.SUN, flags=swe.FLG_SIDEREAL)[0][0]
+    moon = ephemeris.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
+    return (moon - sun) % 360
+
 def get_tithi(jd):
     """Calculate tithi (0-29) from Julian date"""
-    sun = swe.calc_ut(jd, swe.SUN, flags=swe.FLG_SIDEREAL)[0][0]
-    moon = swe.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
-    return int(((moon - sun) % 360) // 12)
-
-def generate_moon_image(phase, size=142, output_size=18):
-    """Generate moon phase image with correct shading for waxing/waning"""
-    # Convert phase (0-29) to illumination fraction (0.0-1.0)
-    phase = phase +1 #to make it from 1 to 30 instead of 0 - 29
-    # Full moon (15) = 1.0, new moon (30) = 0.0
-    illumination = 1 - abs(phase - 15) / 15
-    
-    # Determine if waxing (ശുക്ല) or waning (കൃഷ്ണ)
-    waxing = phase < 15
-    
-    # Create image
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    center = (size//2, size//2)
-    radius = size//2 - 1
-    
-    # Draw full white circle (moon)
-    draw.ellipse((center[0]-radius, center[1]-radius, 
-                center[0]+radius, center[1]+radius), 
-                fill='white')
-    
-    # Draw shadow based on illumination
-    shadow_color = (51, 51, 51, 178)  # #333333 with ~70% opacity
-    
-    for y in range(radius):
-        x = math.sqrt(radius**2 - y**2)
-        x = round(x)
-        
-        if waxing:
-            # Waxing (ശുക്ല): shadow on the LEFT
-            X_left = center[0] - x
-            shade_width = round(2 * x * (1 - illumination))
-            X_right = X_left + shade_width
-        else:
-            # Waning (കൃഷ്ണ): shadow on the RIGHT
-            X_right = center[0] + x
-            shade_width = round(2 * x * (1 - illumination))
-            X_left = X_right - shade_width
-        
-        Y_top = center[1] - y
-        Y_bottom = center[1] + y
-        
-        # Draw shadow lines
-        if shade_width > 0:
-            draw.line((X_left, Y_top, X_right, Y_top), fill=shadow_color)
-            if Y_top != Y_bottom:
-                draw.line((X_left, Y_bottom, X_right, Y_bottom), fill=shadow_color)
-    
-    # Outline
-    draw.ellipse((center[0]-radius, center[1]-radius, 
-                center[0]+radius, center[1]+radius), 
-                outline='white', width=1)
-    
-    img = img.resize((output_size, output_size), Image.LANCZOS)
-    # Convert to base64
-    #buffered = BytesIO()
-    image_path = os.path.join(script_directory, 'moon_output.png')
-    img.save(image_path, format="PNG", optimize=True, compress_level=9)
-    time.sleep(1)
-    #return base64.b64encode(buffered.getvalue()).decode('utf-8')
-    return image_path
+    return int(get_elongation(jd) // 12)
+
+def generate_moon_image(elongation, output_size=18):
+    """Path of the moon icon for the true phase at this elongation (moon_sprites.py; tithi sprites without NumPy)"""
+    from moon_sprites import moon_icon_path
+    return moon_icon_path(elongation, output_size)
 
 
 
@@ -369,12 +135,6 @@ def തിഥി_നക്ഷത്ര_വാരം(input_date=None, LAT=25.3176
     day_of_week = calc_date.strftime("%A")  # Get English weekday name
     വാരം = വാരങ്ങൾ[day_of_week]  # Convert to Malayalam
     
-    def get_sun_event_jd(jd_start_ut, event_type):
-        """Calculate sunrise/sunset Julian Day."""
-        geopos = (LON, LAT, ALT)
-        result = swe.rise_trans(jd_start_ut, swe.SUN, event_type, geopos, 0, 0, swe.FLG_SIDEREAL)
-        return result[1][0]
-
     def jd_to_ist(jd_ut):
         """Convert Julian Day (UT) to IST datetime."""
         # Convert JD to UTC datetime
@@ -395,36 +155,13 @@ def തിഥി_നക്ഷത്ര_വാരം(input_date=None, LAT=25.3176
         dt_ist = dt_utc + datetime.timedelta(hours=5, minutes=30)
         return dt_ist
 
-    def find_transition(start_jd, end_jd, get_value):
-        """Binary search to find when a value changes between start_jd and end_jd."""
-        കൃത്യത = 0.0003  # വിനാഴിക = 24 second
-        initial = get_value(start_jd)
-        final = get_value(end_jd)
-
-        if initial == final:
-            return end_jd  # No transition
-
-        for _ in range(20):  # Max 20 iterations
-            mid_jd = (start_jd + end_jd) / 2
-            mid_val = get_value(mid_jd)
-            if mid_val == initial:
-                start_jd = mid_jd
-            else:
-                end_jd = mid_jd
-            if (end_jd - start_jd) < കൃത്യത:
-                break
-        return end_jd
-
-    # Get sunrise and next day's sunrise
-    dt_ist = datetime.datetime.combine(calc_date, datetime.time(0, 0))
-    dt_utc = dt_ist - datetime.timedelta(hours=IST_OFFSET)
-    jd_start = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour + dt_utc.minute/60)
-    jd_sunrise = get_sun_event_jd(jd_start, swe.CALC_RISE)
-    jd_next_sunrise = get_sun_event_jd(jd_start + 1, swe.CALC_RISE)
+    # Get sunrise and next day's sunrise, from the per-place year table in sun_table.py
+    jd_sunrise = sun_event_jd(calc_date.date(), swe.CALC_RISE, LAT, LON, ALT)
+    jd_next_sunrise = sun_event_jd(calc_date.date() + datetime.timedelta(days=1), swe.CALC_RISE, LAT, LON, ALT)
     
     # Calculate Nakshatra
     def get_nakshatra(jd):
-        moon = swe.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
+        moon = ephemeris.calc_ut(jd, swe.MOON, flags=swe.FLG_SIDEREAL)[0][0]
         return int((moon % 360) // (360 / 27))
     
     if input_date:
@@ -435,17 +172,29 @@ def തിഥി_നക്ഷത്ര_വാരം(input_date=None, LAT=25.3176
         current_nakshatra = get_nakshatra(jd_input)
         return f"{വാരം}\n{തിഥികൾ[current_tithi]}\n{നക്ഷത്രങ്ങൾ[current_nakshatra]}"
     else:
-        tithi_start = get_tithi(jd_sunrise)
-        nakshatra_start = get_nakshatra(jd_sunrise)
         adjust_time = lambda time_str: (datetime.datetime.strptime(time_str, "%H:%M") - datetime.timedelta(hours=6, minutes=30)).strftime("%H:%M")
-        tithi_adjusted_end = adjust_time(jd_to_ist(find_transition(jd_sunrise, jd_next_sunrise, get_tithi)).strftime("%H:%M"))
-        nakshatra_adjusted_end = adjust_time(jd_to_ist(find_transition(jd_sunrise, jd_next_sunrise, get_nakshatra)).strftime("%H:%M"))
+
+        def വരെ(segments, names):
+            """A "name (HH:MM വരെ)" line for every one ending before the next sunrise; else the one lasting all day"""
+            ending = [(i, end) for i, end in segments if end < jd_next_sunrise] or [(segments[0][0], jd_next_sunrise)]
+            return "\n".join(f"{names[i]} ({adjust_time(jd_to_ist(end).strftime('%H:%M'))} വരെ)" for i, end in ending)
+
+        # Every end between the two sunrises, so a kshaya tithi or nakshatra gets its own line.
+        # Read from മലയാളം_panchanga.bin; computed only when the table is missing or does not cover today.
+        try:
+            with TransitionTable(os.path.join(script_directory, "മലയാളം_panchanga.bin")) as പട്ടിക:
+                tithis = പട്ടിക.segments("tithi", jd_sunrise, jd_next_sunrise)
+                nakshatras = പട്ടിക.segments("nakshatra", jd_sunrise, jd_next_sunrise)
+        except (OSError, KeyError, ValueError) as e:
+            dprint(f"[DEBUG] Panchanga table not used: {e}")
+            tithis = tithi_segments(jd_sunrise, jd_next_sunrise)
+            nakshatras = nakshatra_segments(jd_sunrise, jd_next_sunrise)
         #moon_image = generate_moon_image(tithi_start)
         return (
             f"{വാരം}\n"
             #f"| image={moon_image}\n"
-            f"{തിഥികൾ[tithi_start]} ({tithi_adjusted_end} വരെ)\n"
-            f"{നക്ഷത്രങ്ങൾ[nakshatra_start]} ({nakshatra_adjusted_end} വരെ)"
+            f"{വരെ(tithis, തിഥികൾ)}\n"
+            f"{വരെ(nakshatras, നക്ഷത്രങ്ങൾ)}"
         )
             
         
@@ -455,13 +204,6 @@ def തിഥി_നക്ഷത്ര_വാരം(input_date=None, LAT=25.3176
 കാണണം = 1
 
 if കാണണം:
-    import plotly.graph_objects as go
-    from timezonefinder import TimezoneFinder
-    import datetime
-    import pytz
-    import io
-    import base64
-
     def encode_image(image_path): #only if image is being displayed.
         with open(image_path, "rb") as image_file:
             return base64.b64encode(image_file.read()).decode("utf-8")
@@ -470,8 +212,9 @@ if കാണണം:
     user_input = 0 #initializing 
     
     def timezone_adjust(custom_dt, latitude, longitude):
-        tf = TimezoneFinder() # Initialize TimezoneFinder
-        timezone_str = tf.timezone_at(lng=longitude, lat=latitude)
+        import pytz
+        import timezones
+        timezone_str = timezones.timezone_at(latitude, longitude)  # shared finder, cached per place
         if timezone_str is None:
             raise ValueError("Could not determine the time zone for the given coordinates.")
         timezone = pytz.timezone(timezone_str)
@@ -505,13 +248,13 @@ if കാണണം:
         
         elevation = 0  # Sea level
         
-        swe.set_sid_mode(swe.SIDM_LAHIRI)  # Lahiri ayanamsa
-        swe.set_topo(longitude, latitude, elevation) #Don't understand, something like Ujjain as topocentric location for future calls.
+        ephemeris.set_sid_mode(swe.SIDM_LAHIRI)  # Lahiri ayanamsa
+        ephemeris.set_topo(longitude, latitude, elevation) #Don't understand, something like Ujjain as topocentric location for future calls.
     
         positions = {}
     
         for planet, planet_id in planets.items():
-            pos, ret = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
+            pos, ret = ephemeris.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
             lon = pos[0]
             positions[planet] = {"longitude": lon}
             #if planet == "കുജ":
@@ -519,7 +262,7 @@ if കാണണം:
                 
 
     
-        rahu_pos, ret = swe.calc_ut(jd, swe.TRUE_NODE, swe.FLG_SIDEREAL)
+        rahu_pos, ret = ephemeris.calc_ut(jd, swe.TRUE_NODE, swe.FLG_SIDEREAL)
         rahu_lon = rahu_pos[0]
         ketu_lon = (rahu_lon + 180) % 360
     
@@ -540,7 +283,25 @@ if കാണണം:
 
     # Updated function to generate the chart with 12 divisions
     def generate_chart(positions, user_input=None, place_name="ഉജ്ജൈനി"):
-    
+        if user_input:
+            custom_dt_str, lon, lat = user_input
+            custom_dt = datetime.datetime.strptime(custom_dt_str, "%Y-%m-%d %H:%M:%S")
+            adjusted_dt = custom_dt - datetime.timedelta(hours=6, minutes=30)
+            input_Hindu_time = adjusted_dt.strftime("%H:%M")
+            input_Hindu_day = മലയാളദിനം(custom_dt.date(),lat,lon)
+            display_time = f"[{input_Hindu_day}] {input_Hindu_time}"
+            
+        else:
+            display_time = datetime.datetime.now().strftime("%H:%M")
+        
+        location = f"{place_name} ലഗ്നം"
+        
+        image_path = os.path.join(script_directory, 'chart_output.png')
+        if ചാർട്ട്_രീതി == "pillow":
+            from sky_chart import draw_chart
+            return draw_chart(positions, f"{display_time} മണി, {location}", image_path)
+
+        import plotly.graph_objects as go
     
         f = "Noto Sans Malayalam"  # Font family
         r = 3  # Font size reduction as I increase or decrease the chart size
@@ -683,19 +444,6 @@ if കാണണം:
                 showlegend=False
             ))
         
-        if user_input:
-            custom_dt_str, lon, lat = user_input
-            custom_dt = datetime.datetime.strptime(custom_dt_str, "%Y-%m-%d %H:%M:%S")
-            adjusted_dt = custom_dt - datetime.timedelta(hours=6, minutes=30)
-            input_Hindu_time = adjusted_dt.strftime("%H:%M")
-            input_Hindu_day = മലയാളദിനം(custom_dt.date(),lat,lon)
-            display_time = f"[{input_Hindu_day}] {input_Hindu_time}"
-            
-        else:
-            display_time = datetime.datetime.now().strftime("%H:%M")
-        
-        location = f"{place_name} ലഗ്നം"
-        
         # Final artistic layout
         fig.update_layout(
             paper_bgcolor='rgba(0,0,0,0)',  # Fully transparent background
@@ -729,9 +477,9 @@ if കാണണം:
             height=500
         )
 
-        image_path = os.path.join(script_directory, 'chart_output.png')
         fig.write_image(image_path)  # Save to disk
-        time.sleep(1)
+        if not സ്ഥിരസേവനം:  # a daemon's reply must not wait; write_image has finished the file anyway
+            time.sleep(1)
         #with open(image_path, "rb") as image_file:
         #    image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
         return image_path
@@ -743,13 +491,36 @@ if കാണണം:
 
 
 def get_lat_lon_from_place(place_name):
-    """Convert a place name to latitude & longitude using geopy."""
+    """Convert a place name to latitude & longitude: the offline gazetteer first, then Nominatim via geopy if allowed."""
+    import gazetteer
+    try:
+        coordinates = gazetteer.place_coordinates(place_name)
+    except (RuntimeError, ValueError):  # no usable gazetteer: ask Nominatim as before
+        coordinates = None
+    if coordinates:
+        return coordinates
+    if not ഓൺലൈൻ_സ്ഥലം:
+        raise ValueError(f"അറിയാത്ത സ്ഥലം: {place_name}")
+    import geocode_cache
+    cached = geocode_cache.get(place_name)  # earlier Nominatim answers, including "not found"
+    if cached is not geocode_cache.MISSING:
+        if cached is None:
+            raise ValueError(f"അറിയാത്ത സ്ഥലം: {place_name}")
+        return cached
+    from geopy.exc import GeopyError
+    from geopy.geocoders import Nominatim
     geolocator = Nominatim(user_agent="swiftbar_location_picker",timeout=3)
-    location = geolocator.geocode(place_name)
+    try:
+        location = geolocator.geocode(place_name)
+    except GeopyError as e:  # offline or the service refused: the place stays unknown
+        geocode_cache.put(place_name, None, ttl=geocode_cache.ERROR_TTL)
+        raise ValueError(f"അറിയാത്ത സ്ഥലം: {place_name} ({e})") from e
 
     if location:
+        geocode_cache.put(place_name, (location.latitude, location.longitude))
         return location.latitude, location.longitude
     else:
+        geocode_cache.put(place_name, None)
         raise ValueError(f"അറിയാത്ത സ്ഥലം: {place_name}")
 
 
@@ -763,6 +534,7 @@ def main():
 
         # Option to input custom date, time, and location
         '''#To activate custom date astrological chart, ഈ ഭാഗത്തെ ഉത്തേജിപിക്കൂ.
+        import subprocess
         try:
             result = subprocess.run(  # Run AppleScript (osascript) via subprocess
                 [
@@ -828,6 +600,7 @@ def main():
         
 
         if കാണണം:
+            sys.stdout.flush()  # ചാർട്ടിന് മുമ്പേ വാചകം പുറത്ത്
             if user_input:
                 positions = get_planet_positions(custom_dt, lon, lat)
                 image_path = generate_chart(positions, user_input, place_name)
@@ -838,11 +611,72 @@ def main():
             #dprint("IMAGE: iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGNgYAAAAAMAASsJTYQAAAAASUVORK5CYII=") # 1x1 transparent pixel base64 PNG
             print("IMAGE-FILE: " + image_path)
 
+        dprint(f"[DEBUG] Ephemeris cache: {ephemeris.stats()}")
+        if "geocode_cache" in sys.modules:
+            dprint(f"[DEBUG] Geocode cache: {sys.modules['geocode_cache'].stats()}")
 
     except Exception as e:
         print("Error: Check script")
         print("---")
         print(str(e))
 
+# ---- സ്ഥിരസേവനം (daemon mode) ----
+# Keeps swisseph and PIL warm between refreshes instead of paying for a fresh interpreter each
+# time. Every reply is exactly the text main() prints. Charts are drawn with Pillow and replies do
+# not sleep, unless --chart plotly asks for kaleido.
+#   --serve          : one request per stdin line; each reply is followed by REPLY_END
+#   --socket PATH    : one request per Unix socket connection; the reply is the whole stream
+REPLY_END = "\x1e\n"  # ASCII record separator on its own line
+
+
+def render_refresh():
+    """Run main() and return what it prints"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        main()
+    return buffer.getvalue()
+
+
+def serve_stdio():
+    """Answer refresh requests arriving as lines on stdin until EOF or 'quit'"""
+    for line in sys.stdin:
+        if line.strip() in ("quit", "exit"):
+            break
+        sys.stdout.write(render_refresh() + REPLY_END)
+        sys.stdout.flush()
+
+
+def serve_socket(path):
+    """Answer one refresh per connection on a Unix domain socket, one at a time"""
+    import socketserver  # only the daemon needs it; keeps the plain cold start lean
+
+    class RefreshHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.wfile.write(render_refresh().encode("utf-8"))
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    with socketserver.UnixStreamServer(path, RefreshHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Malayalam calendar menu-bar refresh")
+    parser.add_argument("--serve", action="store_true", help="stay running and answer refreshes from stdin")
+    parser.add_argument("--socket", help="stay running and answer refreshes on this Unix socket")
+    parser.add_argument("--chart", choices=["plotly", "pillow"],
+                        help=f"chart renderer (default {ചാർട്ട്_രീതി}, or pillow with --serve/--socket)")
+    args = parser.parse_args()
+    സ്ഥിരസേവനം = bool(args.serve or args.socket)
+    ചാർട്ട്_രീതി = args.chart or ("pillow" if സ്ഥിരസേവനം else ചാർട്ട്_രീതി)
+    if സ്ഥിരസേവനം:  # refreshes ask for the same instants again; a single run never does
+        ephemeris.use_cache()
+    if args.socket:
+        serve_socket(args.socket)
+    elif args.serve:
+        serve_stdio()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import array
+import datetime
+import math
+import os
+import sys
+import swisseph as swe
+from atomic_file import atomic_write
+
+# സൂര്യോദയം/അസ്തമയം tables: sunrise and sunset never change for a place and date, so they are
+# computed a year at a time and kept in sun_cache/ as raw float64 arrays, [rise, set] per day,
+# each searched from 00:00 IST of its date like get_sun_event_jd(ist_midnight_jd(date), ...).
+# A day swisseph could not solve is stored as NaN and asked for again on use.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "sun_cache")
+TABLE_VERSION = 1
+EVENTS = (swe.CALC_RISE, swe.CALC_SET)
+
+
+def table_path(year, LAT, LON, ALT=0):
+    return os.path.join(CACHE_DIR, f"v{TABLE_VERSION}_{LAT:.4f}_{LON:.4f}_{ALT:g}_{year}.bin")
+
+
+def build_year(year, LAT, LON, ALT=0):
+    """Compute every sunrise and sunset of the year at the place, save them and return the array"""
+    from sankranti import get_sun_event_jd, ist_midnight_jd
+    events = array.array("d")
+    date = datetime.date(year, 1, 1)
+    while date.year == year:
+        jd_start = ist_midnight_jd(date)
+        for event_type in EVENTS:
+            try:
+                events.append(get_sun_event_jd(jd_start, event_type, LAT, LON, ALT))
+            except ValueError:  # e.g. no sunrise at all; left for rise_trans to report on use
+                events.append(math.nan)
+        date += datetime.timedelta(days=1)
+
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            (events if sys.byteorder == "little" else _swapped(events)).tofile(f)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(table_path(year, LAT, LON, ALT), write)
+    except OSError:  # not writable: still use what was computed
+        pass
+    return events
+
+
+def _swapped(events):
+    copy = array.array("d", events)
+    copy.byteswap()
+    return copy
+
+
+_years = {}  # (year, LAT, LON, ALT): array, for the life of the process
+
+
+def load_year(year, LAT, LON, ALT=0, build=True):
+    """The year's [rise, set, rise, set, …] array: from memory, disk, or built (None without build)"""
+    key = (year, LAT, LON, ALT)
+    if key in _years:
+        return _years[key]
+    days = (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days
+    events = array.array("d")
+    try:
+        with open(table_path(year, LAT, LON, ALT), "rb") as f:
+            events.fromfile(f, 2 * days)
+        if sys.byteorder != "little":
+            events.byteswap()
+    except (OSError, EOFError):  # missing or short
+        if not build:
+            return None
+        events = build_year(year, LAT, LON, ALT)
+    _years[key] = events
+    return events
+
+
+def sun_event_jd(date, event_type, LAT, LON, ALT=0, build=True):
+    """
+    Sunrise (CALC_RISE) or sunset (CALC_SET) JD (UT) following 00:00 IST of date, from the year table.
+    Without build, a missing year is not computed. Any miss falls back to swe.rise_trans.
+    """
+    events = load_year(date.year, LAT, LON, ALT, build)
+    if events is not None:
+        jd = events[2 * (date.timetuple().tm_yday - 1) + EVENTS.index(event_type)]
+        if not math.isnan(jd):
+            return jd
+    from sankranti import get_sun_event_jd, ist_midnight_jd
+    return get_sun_event_jd(ist_midnight_jd(date), event_type, LAT, LON, ALT)
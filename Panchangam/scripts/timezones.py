@@ -0,0 +1,49 @@
+import functools
+
+# One TimezoneFinder for the process: it is created on first use, not on every timezone_adjust(),
+# since loading its polygon data costs far more than a lookup. Names are cached per point rounded
+# to GRID decimals (~11 m at 4), so repeated places (a birth town, the default location) never
+# reach the polygons again. For thousands of records, timezone_at_many() looks up each distinct
+# point once. Call finder(in_memory=True) before the first lookup to hold the polygons in RAM.
+
+GRID = 4  # decimals of latitude/longitude a cached name stands for
+CACHE_SIZE = 65536
+
+_finder = None
+
+
+def finder(in_memory=False):
+    """The shared TimezoneFinder, created on the first call (in_memory only matters then)"""
+    global _finder
+    if _finder is None:
+        from timezonefinder import TimezoneFinder
+        _finder = TimezoneFinder(in_memory=in_memory)
+    return _finder
+
+
+def _grid(latitude, longitude):
+    return round(latitude, GRID), round(longitude, GRID)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _timezone_at(latitude, longitude):
+    return finder().timezone_at(lng=longitude, lat=latitude)
+
+
+def timezone_at(latitude, longitude):
+    """IANA time zone name at the point (None in open ocean), from the cache when near a point asked before"""
+    return _timezone_at(*_grid(latitude, longitude))
+
+
+def timezone_at_many(coordinates):
+    """timezone_at() for an iterable of (latitude, longitude), in order; each distinct point is looked up once"""
+    points = [_grid(latitude, longitude) for latitude, longitude in coordinates]
+    names = {point: _timezone_at(*point) for point in dict.fromkeys(points)}
+    return [names[point] for point in points]
+
+
+def stats():
+    """{"hits", "misses", "hit_rate"} of the name cache"""
+    info = _timezone_at.cache_info()
+    calls = info.hits + info.misses
+    return {"hits": info.hits, "misses": info.misses, "hit_rate": info.hits / calls if calls else 0.0}
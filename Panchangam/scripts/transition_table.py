@@ -0,0 +1,145 @@
+import array
+import bisect
+import mmap
+import struct
+import sys
+from atomic_file import atomic_write
+from panchanga import LIMBS, limb_segments
+
+# മലയാളം_panchanga.bin: every tithi, nakshatra, yoga and karana end over a date range, so the
+# panchanga at any instant is a bisect instead of a search with swisseph.
+#   header : magic, epoch (JD UT the sweep started at), number of limbs
+#   limb   : name, index current at the epoch, number of divisions (30/27/27/60), number of ends
+#   ends   : for each limb in header order, uint32 seconds after the epoch, ascending
+# Each end starts the next division, so the indices follow from the first one. uint32 seconds
+# cover about 136 years; a longer table is written as MLPAN2, the same with uint64 seconds.
+MAGIC = b"MLPAN1"
+MAGIC_WIDE = b"MLPAN2"
+TYPECODES = {MAGIC: "I", MAGIC_WIDE: "Q"}
+HEADER = struct.Struct("<6s2xdI")
+LIMB = struct.Struct("<12sBB2xI")
+
+
+def _seconds(jd, epoch):
+    return round((jd - epoch) * 86400)
+
+
+def chebyshev_segments(jd_start, jd_end, limbs):
+    """
+    {limb: segments} with every end placed from Chebyshev fits of the Sun and Moon in one vectorised
+    pass. They agree with the swisseph sweep to a fraction of a second (chebyshev.MAX_ERROR).
+    """
+    from chebyshev import coarse_segments, fit_sun_moon, limb_angles
+    angles = limb_angles(*fit_sun_moon(jd_start - 1, jd_end + 3))
+    return {limb: coarse_segments(jd_start, jd_end, *angles[limb]) for limb in limbs}
+
+
+def write_transition_table(jd_start, jd_end, output_path, limbs=tuple(LIMBS), chebyshev=False):
+    """
+    Sweep jd_start → jd_end once per limb and save every end; returns {limb: number of ends}.
+    With chebyshev, the ends are bracketed from NumPy Chebyshev fits first (chebyshev.py).
+    """
+    if chebyshev:
+        all_segments = chebyshev_segments(jd_start, jd_end, limbs)
+    else:
+        all_segments = {limb: limb_segments(limb, jd_start, jd_end) for limb in limbs}
+    last = max(_seconds(segments[-1][1], jd_start) for segments in all_segments.values())
+    magic = MAGIC if last < 2 ** 32 else MAGIC_WIDE
+    sweeps = {}
+    for limb, segments in all_segments.items():
+        sweeps[limb] = (segments[0][0], array.array(TYPECODES[magic], (_seconds(end, jd_start) for _, end in segments)))
+
+    for limb in sweeps:
+        if len(limb) > 12:
+            raise ValueError(f"Limb name {limb!r} is longer than 12 characters")
+
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(magic, jd_start, len(sweeps)))
+            for limb, (first_index, ends) in sweeps.items():
+                f.write(LIMB.pack(limb.encode("ascii"), first_index, round(360 / LIMBS[limb][1]), len(ends)))
+            for _, ends in sweeps.values():
+                if sys.byteorder != "little":
+                    ends.byteswap()
+                f.write(ends.tobytes())
+
+    atomic_write(output_path, write)
+    return {limb: len(ends) for limb, (_, ends) in sweeps.items()}
+
+
+class TransitionTable:
+    """
+    Memory-mapped reader for മലയാളം_panchanga.bin: the division current at an instant, and its end,
+    by bisect straight over the mapped ends; only the pages a bisect touches are read.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if empty
+        except BaseException:
+            self._file.close()
+            raise
+        self._limbs = {}
+        try:
+            self._read_limbs(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_limbs(self, path):
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{path} is not a panchanga transition table")
+        magic, self.epoch, limb_count = HEADER.unpack_from(self._map, 0)
+        if magic not in TYPECODES:
+            raise ValueError(f"{path} is not a panchanga transition table")
+        typecode = TYPECODES[magic]
+        itemsize = struct.calcsize(typecode)
+        offset = HEADER.size + limb_count * LIMB.size
+        for i in range(limb_count):
+            name, first_index, divisions, count = LIMB.unpack_from(self._map, HEADER.size + i * LIMB.size)
+            if len(self._map) < offset + count * itemsize:
+                raise ValueError(f"{path} is truncated")
+            if sys.byteorder == "little":
+                ends = memoryview(self._map)[offset:offset + count * itemsize].cast(typecode)
+            else:  # the file is little-endian: a swapped copy
+                ends = array.array(typecode, self._map[offset:offset + count * itemsize])
+                ends.byteswap()
+            self._limbs[name.rstrip(b"\0").decode("ascii")] = (first_index, divisions, ends)
+            offset += count * itemsize
+
+    @property
+    def end(self):
+        """Last JD (UT) at which every limb is known"""
+        return self.epoch + min(ends[-1] for _, _, ends in self._limbs.values()) / 86400
+
+    def at(self, limb, jd):
+        """(index, end_jd) of the limb's division current at jd"""
+        first_index, divisions, ends = self._limbs[limb]
+        i = bisect.bisect_right(ends, (jd - self.epoch) * 86400)
+        if jd < self.epoch or i == len(ends):
+            raise KeyError(f"JD {jd} is outside the {limb} table")
+        return (first_index + i) % divisions, self.epoch + ends[i] / 86400
+
+    def segments(self, limb, jd_start, jd_end):
+        """The same [(index, end_jd)] as panchanga.segments(), read from the table"""
+        first_index, divisions, ends = self._limbs[limb]
+        i = bisect.bisect_right(ends, (jd_start - self.epoch) * 86400)
+        j = bisect.bisect_left(ends, (jd_end - self.epoch) * 86400)
+        if jd_start < self.epoch or j == len(ends):
+            raise KeyError(f"JD {jd_start} → {jd_end} is outside the {limb} table")
+        return [((first_index + k) % divisions, self.epoch + ends[k] / 86400) for k in range(i, j + 1)]
+
+    def close(self):
+        for _, _, ends in self._limbs.values():
+            if isinstance(ends, memoryview):
+                ends.release()  # the map cannot close while a view of it is held
+        self._limbs = {}
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()